@@ -1,10 +1,10 @@
 import streamlit as st
-import json
-import os
-import hashlib
 import re
 import time
 
+from utils.passwords import dummy_hash, hash_password, verify_password
+from utils.user_store import get_user_store
+
 # -------------------------------------------------
 # PAGE CONFIG (NO SIDEBAR)
 # -------------------------------------------------
@@ -20,20 +20,14 @@ st.set_page_config(
 ADMIN_MASTER_KEY = "GW-ADMIN-2026"
 
 # -------------------------------------------------
-# PATHS
+# USER STORE
 # -------------------------------------------------
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-DATA_DIR = os.path.join(BASE_DIR, "data")
-os.makedirs(DATA_DIR, exist_ok=True)
-
-USERS_PATH = os.path.join(DATA_DIR, "users.json")
+# Accounts live in data/users.db; users.json is migrated on first use
+users = get_user_store()
 
 # -------------------------------------------------
 # HELPERS
 # -------------------------------------------------
-def hash_password(password):
-    return hashlib.sha256(password.encode()).hexdigest()
-
 def valid_email(email):
     return re.match(r"^[a-zA-Z0-9._%+-]+@(gmail|yahoo|outlook|hotmail)\.com$", email)
 
@@ -46,16 +40,6 @@ def password_is_strong(password):
         re.search(r"[^A-Za-z0-9]", password)
     )
 
-def load_users():
-    if os.path.exists(USERS_PATH):
-        with open(USERS_PATH, "r") as f:
-            return json.load(f)
-    return {}
-
-def save_users(users):
-    with open(USERS_PATH, "w") as f:
-        json.dump(users, f, indent=4)
-
 def redirect_with_loader():
     with st.spinner("Launching dashboard..."):
         time.sleep(1.2)
@@ -108,7 +92,6 @@ if not st.session_state.is_authenticated:
     """, unsafe_allow_html=True)
 
     tabs = st.tabs(["🔐 Login", "📝 Sign Up", "🛠 Admin", "🚀 Demo"])
-    users = load_users()
 
     # ---------------- LOGIN ----------------
     with tabs[0]:
@@ -118,9 +101,16 @@ if not st.session_state.is_authenticated:
             submit = st.form_submit_button("Login")
 
         if submit:
-            if email in users and users[email]["password"] == hash_password(password):
+            user = users.get(email)
+            # Unknown emails still pay for one KDF run (no timing oracle)
+            ok, needs_rehash = verify_password(password, user["password"] if user else dummy_hash())
+            if ok and user:
+                if needs_rehash:
+                    # Upgrade legacy SHA-256 / old-cost hashes in place
+                    user["password"] = hash_password(password)
+                    users.set_password(email, user["password"])
                 st.session_state.is_authenticated = True
-                st.session_state.user = users[email]
+                st.session_state.user = user
                 redirect_with_loader()
             else:
                 st.error("Invalid credentials")
@@ -138,23 +128,25 @@ if not st.session_state.is_authenticated:
         if st.button("Create Account"):
             if not valid_email(email):
                 st.error("Use a valid email provider (gmail, outlook, yahoo)")
-            elif email in users:
+            elif users.exists(email):
                 st.error("User already exists")
             elif password != confirm:
                 st.error("Passwords do not match")
             elif not password_is_strong(password):
                 st.error("Password too weak")
             else:
-                users[email] = {
+                user = {
                     "email": email,
                     "password": hash_password(password),
                     "name": name,
                     "role": role
                 }
-                save_users(users)
-                st.session_state.is_authenticated = True
-                st.session_state.user = users[email]
-                redirect_with_loader()
+                if not users.create(user):
+                    st.error("User already exists")
+                else:
+                    st.session_state.is_authenticated = True
+                    st.session_state.user = user
+                    redirect_with_loader()
 
     # ---------------- ADMIN ----------------
     with tabs[2]:
@@ -1,25 +1,18 @@
-import numpy as np
 import plotly.graph_objects as go
 
+from components.surface import surface_trace
+
 def groundwater_surface(predicted_level):
     """
     Creates a smooth 3D surface representing groundwater depth
     """
 
-    # Create grid
-    x = np.linspace(-5, 5, 40)
-    y = np.linspace(-5, 5, 40)
-    X, Y = np.meshgrid(x, y)
-
-    # Surface depth influenced by prediction
-    Z = predicted_level + 0.4 * np.sin(X) * np.cos(Y)
-
+    # Surface depth influenced by prediction (shared cached mesh)
     fig = go.Figure(
         data=[
-            go.Surface(
-                x=X,
-                y=Y,
-                z=Z,
+            surface_trace(
+                predicted_level,
+                0.4,
                 colorscale="Blues",
                 showscale=False
             )
@@ -0,0 +1,52 @@
+from functools import lru_cache
+
+import numpy as np
+import plotly.graph_objects as go
+
+# -------------------------------------------------
+# SHARED SURFACE MESH
+# -------------------------------------------------
+EXTENT = 5.0          # surfaces span [-EXTENT, EXTENT] on both axes
+RESOLUTION = 40       # grid points per axis
+
+# Base fields, evaluated once per (field, resolution, dtype)
+FIELDS = {
+    "waves": lambda X, Y: np.sin(X) * np.cos(Y),
+    "ripples": lambda X, Y: np.sin(X ** 2 + Y ** 2)
+}
+
+@lru_cache(maxsize=None)
+def surface_mesh(field="waves", resolution=RESOLUTION, dtype="float32"):
+    """
+    (axis, field) for a square grid: axis is 1-D (resolution,), field is
+    2-D (resolution, resolution). Both are cached and read-only, so every
+    caller shares one copy.
+    """
+    axis = np.linspace(-EXTENT, EXTENT, resolution)
+    X, Y = np.meshgrid(axis, axis)
+    base = FIELDS[field](X, Y).astype(dtype)
+    axis = axis.astype(dtype)
+    axis.flags.writeable = False
+    base.flags.writeable = False
+    return axis, base
+
+def surface_z(offset, amplitude=1.0, field="waves", resolution=RESOLUTION, dtype="float32"):
+    """
+    offset + amplitude * field on the cached grid; the only per-call work.
+    """
+    _, base = surface_mesh(field, resolution, dtype)
+    return (base * base.dtype.type(amplitude)) + base.dtype.type(offset)
+
+def surface_trace(offset, amplitude=1.0, field="waves", resolution=RESOLUTION,
+                  dtype="float32", **surface_kwargs):
+    """
+    go.Surface at the given offset. x/y go out as 1-D axes (Plotly
+    broadcasts them), so the figure carries one 2-D array instead of three.
+    """
+    axis, _ = surface_mesh(field, resolution, dtype)
+    return go.Surface(
+        x=axis,
+        y=axis,
+        z=surface_z(offset, amplitude, field, resolution, dtype),
+        **surface_kwargs
+    )
@@ -1,21 +1,16 @@
 # app/components/visual_3d.py
 
 import plotly.graph_objects as go
-import numpy as np
 
-def groundwater_surface(z_value: float):
-    x = np.linspace(-5, 5, 40)
-    y = np.linspace(-5, 5, 40)
-    x, y = np.meshgrid(x, y)
-
-    z = np.sin(x**2 + y**2) * 0.3 + z_value
+from components.surface import surface_trace
 
+def groundwater_surface(z_value: float):
     fig = go.Figure(
         data=[
-            go.Surface(
-                x=x,
-                y=y,
-                z=z,
+            surface_trace(
+                z_value,
+                0.3,
+                field="ripples",
                 colorscale="Blues",
                 showscale=False
             )
@@ -1,16 +1,14 @@
 import streamlit as st
-import pandas as pd
 import json
 import os
 import time
 from datetime import datetime
-from PIL import Image, ImageFile
+from utils.cache import render_cache_panel, track_page
 if not st.session_state.get("is_authenticated"):
     st.warning("Please log in first.")
     st.page_link("app.py", label="🔐 Go to Login")
     st.stop()
-
-ImageFile.LOAD_TRUNCATED_IMAGES = True
+track_page("profile")
 
 # -------------------------------------------------
 # PAGE CONFIG
@@ -246,6 +244,10 @@ with left:
     uploaded_img = st.file_uploader("Upload profile picture", type=["png","jpg","jpeg"])
     if uploaded_img:
         try:
+            # PIL is only needed for uploads; keep it off the page's cold start
+            from PIL import Image, ImageFile
+            ImageFile.LOAD_TRUNCATED_IMAGES = True
+
             img = Image.open(uploaded_img)
             img.verify()
             img = Image.open(uploaded_img)
@@ -324,3 +326,4 @@ st.markdown("""
 © 2026 Groundwater Intelligence Platform
 </div>
 """, unsafe_allow_html=True)
+render_cache_panel()
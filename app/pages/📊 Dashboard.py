@@ -1,14 +1,16 @@
 import streamlit as st
-import pandas as pd
 import numpy as np
-import plotly.express as px
 import plotly.graph_objects as go
-import os
 from utils.floating_assistant import render_floating_assistant
+from components.surface import surface_trace
+from utils.downsample import downsample
+from utils.history_reader import get_history_reader
+from utils.cache import cached, history_month_stats, render_cache_panel, track_page
 if not st.session_state.get("is_authenticated"):
     st.warning("Please log in first.")
     st.page_link("app.py", label="🔐 Go to Login")
     st.stop()
+track_page("dashboard")
 
 # -------------------------------------------------
 # Page config
@@ -207,6 +209,20 @@ A data-driven platform for monitoring, predicting, and understanding underground
 """, unsafe_allow_html=True)
 
 st.markdown("<br>", unsafe_allow_html=True)
+# -------------------------------------------------
+# LOAD HISTORY (INCREMENTAL STORE → SESSION → FALLBACK)
+# -------------------------------------------------
+history = get_history_reader()
+
+if history.count:
+    trend_x, trend_y = history.series()
+    last_prediction, avg_prediction, runs = history.last, history.mean, history.count
+else:
+    session_rows = st.session_state.get("prediction_history") or [{"Prediction_m": v} for v in (3.2, 3.4, 3.3)]
+    session_y = np.array([row["Prediction_m"] for row in session_rows], dtype=float)
+    trend_x, trend_y = downsample(np.arange(1, len(session_y) + 1), session_y)
+    last_prediction, avg_prediction, runs = session_y[-1], session_y.mean(), len(session_y)
+
 # -------------------------------------------------
 # KPI CARDS
 # -------------------------------------------------
@@ -220,40 +236,12 @@ def metric(label, value):
     </div>
     """, unsafe_allow_html=True)
 
-with c1: metric("Last Prediction", "Live")
-with c2: metric("Avg Groundwater", "≈ 3.4 m")
-with c3: metric("Predictions Run", "Persistent")
+with c1: metric("Last Prediction", f"{last_prediction:.2f} m")
+with c2: metric("Avg Groundwater", f"≈ {avg_prediction:.1f} m")
+with c3: metric("Predictions Run", f"{runs:,}")
 with c4: metric("Region", "India")
 with c5: metric("Model Status", "Active")
 
-# -------------------------------------------------
-# LOAD HISTORY (CSV → SESSION → FALLBACK)
-# -------------------------------------------------
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-CSV_PATH = os.path.join(BASE_DIR, "data", "prediction_history.csv")
-
-if os.path.exists(CSV_PATH):
-    history_df = pd.read_csv(CSV_PATH)
-elif "prediction_history" in st.session_state:
-    history_df = pd.DataFrame(st.session_state.prediction_history)
-else:
-    history_df = pd.DataFrame({"Prediction_m": [3.2, 3.4, 3.3]})
-
-# -------------------------------------------------
-# 🔒 COLUMN NORMALIZATION (FINAL FIX)
-# -------------------------------------------------
-if "Prediction_m" not in history_df.columns:
-    for col in history_df.columns:
-        if "predict" in col.lower():
-            history_df.rename(columns={col: "Prediction_m"}, inplace=True)
-            break
-
-if "Prediction_m" not in history_df.columns:
-    st.warning("No prediction data available yet.")
-    st.stop()
-
-history_df["Index"] = range(1, len(history_df) + 1)
-
 # -------------------------------------------------
 # TREND + CONFIDENCE BAND
 # -------------------------------------------------
@@ -262,41 +250,48 @@ st.markdown("""
 <div class="section-subtle">Groundwater depth with uncertainty</div>
 """, unsafe_allow_html=True)
 
-confidence = 0.1
-history_df["Upper"] = history_df["Prediction_m"] + confidence
-history_df["Lower"] = history_df["Prediction_m"] - confidence
-
-fig = go.Figure()
-
-fig.add_trace(go.Scatter(
-    x=history_df["Index"],
-    y=history_df["Prediction_m"],
-    mode="lines+markers",
-    name="Prediction",
-    line=dict(color=ACCENT, width=3)
-))
-
-fig.add_trace(go.Scatter(
-    x=list(history_df["Index"]) + list(history_df["Index"])[::-1],
-    y=list(history_df["Upper"]) + list(history_df["Lower"])[::-1],
-    fill="toself",
-    fillcolor="rgba(79,195,247,0.15)",
-    line=dict(color="rgba(255,255,255,0)"),
-    hoverinfo="skip",
-    name="Confidence (±0.1 m)"
-))
-
-fig.update_layout(
-    paper_bgcolor="rgba(0,0,0,0)",
-    plot_bgcolor="rgba(0,0,0,0)",
-    font_color=TEXT,
-    height=380
-)
+@cached("data", max_entries=8)
+def trend_figure(trend_x, trend_y, accent, text):
+    confidence = 0.1
+    trend_upper = trend_y + confidence
+    trend_lower = trend_y - confidence
+
+    fig = go.Figure()
+
+    fig.add_trace(go.Scatter(
+        x=trend_x,
+        y=trend_y,
+        mode="lines+markers",
+        name="Prediction",
+        line=dict(color=accent, width=3)
+    ))
+
+    fig.add_trace(go.Scatter(
+        x=np.concatenate([trend_x, trend_x[::-1]]),
+        y=np.concatenate([trend_upper, trend_lower[::-1]]),
+        fill="toself",
+        fillcolor="rgba(79,195,247,0.15)",
+        line=dict(color="rgba(255,255,255,0)"),
+        hoverinfo="skip",
+        name="Confidence (±0.1 m)"
+    ))
+
+    fig.update_layout(
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        font_color=text,
+        height=380
+    )
+    return fig
 
 st.markdown("<div class='card'>", unsafe_allow_html=True)
-st.plotly_chart(fig, use_container_width=True)
+st.plotly_chart(trend_figure(trend_x, trend_y, ACCENT, TEXT), use_container_width=True)
 st.markdown("</div>", unsafe_allow_html=True)
 
+if history.count:
+    with st.expander("📅 Monthly statistics"):
+        st.dataframe(history_month_stats(history.last_id).round(2), use_container_width=True)
+
 # -------------------------------------------------
 # 3D VISUALS
 # -------------------------------------------------
@@ -306,14 +301,10 @@ st.markdown("""
 
 left, right = st.columns(2)
 
+@cached("data", max_entries=16)
 def groundwater_surface(offset):
-    x = np.linspace(-5, 5, 40)
-    y = np.linspace(-5, 5, 40)
-    X, Y = np.meshgrid(x, y)
-    Z = offset + 0.3 * np.sin(X) * np.cos(Y)
-
     fig = go.Figure(
-        data=[go.Surface(x=X, y=Y, z=Z, colorscale="Blues", showscale=False)]
+        data=[surface_trace(offset, 0.3, colorscale="Blues", showscale=False)]
     )
     fig.update_layout(
         scene=dict(xaxis_visible=False, yaxis_visible=False, zaxis_visible=False),
@@ -322,20 +313,12 @@ def groundwater_surface(offset):
     )
     return fig
 
+@cached("data")
 def aquifer_layers():
-    x = np.linspace(-5, 5, 40)
-    y = np.linspace(-5, 5, 40)
-    X, Y = np.meshgrid(x, y)
-
     layers = []
     for depth in [3.2, 3.5, 3.8]:
         layers.append(
-            go.Surface(
-                x=X, y=Y,
-                z=depth + 0.1*np.sin(X)*np.cos(Y),
-                opacity=0.6,
-                showscale=False
-            )
+            surface_trace(depth, 0.1, opacity=0.6, showscale=False)
         )
 
     fig = go.Figure(data=layers)
@@ -348,7 +331,7 @@ def aquifer_layers():
 
 with left:
     st.markdown("<div class='card'>", unsafe_allow_html=True)
-    st.plotly_chart(groundwater_surface(history_df["Prediction_m"].iloc[-1]), use_container_width=True)
+    st.plotly_chart(groundwater_surface(last_prediction), use_container_width=True)
     st.markdown("</div>", unsafe_allow_html=True)
 
 with right:
@@ -390,3 +373,4 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 render_floating_assistant("dashboard")
+render_cache_panel()
@@ -1,12 +1,12 @@
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
 from utils.floating_assistant import render_floating_assistant
+from utils.cache import render_cache_panel, track_page
 if not st.session_state.get("is_authenticated"):
     st.warning("Please log in first.")
     st.page_link("app.py", label="🔐 Go to Login")
     st.stop()
+track_page("learn")
 # ================= PAGE CONFIG =================
 st.set_page_config(
     page_title="Learn | Groundwater Intelligence",
@@ -300,6 +300,10 @@ x = np.random.uniform(0, 100, 70)
 y = np.random.uniform(15, 40, 70)
 z = 65 - 0.35 * x + 0.4 * y + np.random.normal(0, 4, 70)
 
+# matplotlib is imported here, not at the top, so everything above
+# renders before its ~0.5 s import
+import matplotlib.pyplot as plt
+
 fig = plt.figure()
 ax = fig.add_subplot(111, projection="3d")
 ax.scatter(x, y, z)
@@ -360,3 +364,4 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 render_floating_assistant("learn")
+render_cache_panel()
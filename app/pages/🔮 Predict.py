@@ -1,14 +1,17 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
 import plotly.graph_objects as go
-import joblib
-import os
+from components.surface import surface_trace
 from utils.floating_assistant import render_floating_assistant
+from utils.history_writer import get_history_writer
+from utils.path_fix import fix_path
+from utils.cache import cached, lookup_grid, render_cache_panel, track_page
+
+fix_path()
 if not st.session_state.get("is_authenticated"):
     st.warning("Please log in first.")
     st.page_link("app.py", label="🔐 Go to Login")
     st.stop()
+track_page("predict")
 
 # -------------------------------------------------
 # PAGE CONFIG
@@ -40,16 +43,6 @@ with st.sidebar:
         st.session_state.clear()
         st.switch_page("app.py")
 
-# -------------------------------------------------
-# PATHS (MODEL OUTSIDE app/)
-# -------------------------------------------------
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-MODEL_PATH = os.path.join(BASE_DIR, "model", "groundwater_model.pkl")
-SCALER_PATH = os.path.join(BASE_DIR, "model", "scaler.pkl")
-
-model = joblib.load(MODEL_PATH)
-scaler = joblib.load(SCALER_PATH)
-
 # -------------------------------------------------
 # SHARED THEME STATE (WITH DASHBOARD)
 # -------------------------------------------------
@@ -232,19 +225,12 @@ with left:
 # -------------------------------------------------
 # PREDICTION LOGIC
 # -------------------------------------------------
-input_df = pd.DataFrame([{
-    "Temperature_C": temp,
-    "Rainfall_mm": rain,
-    "pH": ph,
-    "Dissolved_Oxygen_mg_L": do,
-    "Month": month_num
-}])
-
-X_scaled = scaler.transform(input_df)
-prediction = float(model.predict(X_scaled)[0])
+# Precomputed grid over the slider space: array index + interpolation,
+# no sklearn call on reruns
+prediction = lookup_grid().lookup(month_num, temp, rain, ph, do)
 
 # -------------------------------------------------
-# SAVE PREDICTION (SESSION + CSV)
+# SAVE PREDICTION (SESSION + WRITE-BEHIND HISTORY)
 # -------------------------------------------------
 if "prediction_history" not in st.session_state:
     st.session_state.prediction_history = []
@@ -256,15 +242,11 @@ record = {
 
 st.session_state.prediction_history.append(record)
 
-DATA_DIR = os.path.join(BASE_DIR, "data")
-os.makedirs(DATA_DIR, exist_ok=True)
-CSV_PATH = os.path.join(DATA_DIR, "prediction_history.csv")
-
-df_new = pd.DataFrame([record])
-if os.path.exists(CSV_PATH):
-    df_new.to_csv(CSV_PATH, mode="a", header=False, index=False)
-else:
-    df_new.to_csv(CSV_PATH, index=False)
+get_history_writer().append(
+    record["Prediction_m"],
+    user=st.session_state.user.get("email", st.session_state.user.get("name")),
+    month=month
+)
 
 # -------------------------------------------------
 # STATUS CLASSIFICATION
@@ -282,19 +264,13 @@ else:
 # -------------------------------------------------
 # 3D GROUNDWATER + AQUIFER VISUAL
 # -------------------------------------------------
-with right:
-    st.markdown("<div class='card'>", unsafe_allow_html=True)
-
-    x = np.linspace(-5, 5, 50)
-    y = np.linspace(-5, 5, 50)
-    X, Y = np.meshgrid(x, y)
-
+@cached("data", max_entries=64)
+def prediction_surface(prediction, show_aquifer):
     wave_strength = (prediction - 2.5) * 0.35
-    Z = prediction + wave_strength * np.sin(X) * np.cos(Y)
 
     surfaces = [
-        go.Surface(
-            x=X, y=Y, z=Z,
+        surface_trace(
+            prediction, wave_strength, resolution=50,
             colorscale="Blues",
             opacity=0.95,
             showscale=False
@@ -304,12 +280,7 @@ with right:
     if show_aquifer:
         for depth in [prediction + 0.5, prediction + 1.0]:
             surfaces.append(
-                go.Surface(
-                    x=X, y=Y,
-                    z=depth + 0.1*np.sin(X)*np.cos(Y),
-                    opacity=0.35,
-                    showscale=False
-                )
+                surface_trace(depth, 0.1, resolution=50, opacity=0.35, showscale=False)
             )
 
     fig = go.Figure(data=surfaces)
@@ -324,8 +295,13 @@ with right:
         paper_bgcolor="rgba(0,0,0,0)",
         margin=dict(l=0, r=0, t=0, b=0)
     )
+    return fig
+
+with right:
+    st.markdown("<div class='card'>", unsafe_allow_html=True)
 
-    st.plotly_chart(fig, use_container_width=True)
+    # Rounded to the displayed precision so nearby slider values share a figure
+    st.plotly_chart(prediction_surface(round(prediction, 2), show_aquifer), use_container_width=True)
 
     st.markdown(
         f"""
@@ -387,3 +363,4 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 render_floating_assistant("predict")
+render_cache_panel()
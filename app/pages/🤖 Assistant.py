@@ -1,10 +1,11 @@
 import streamlit as st
-import pandas as pd
 import time
+from utils.cache import render_cache_panel, track_page
 if not st.session_state.get("is_authenticated"):
     st.warning("Please log in first.")
     st.page_link("app.py", label="🔐 Go to Login")
     st.stop()
+track_page("assistant")
 # -------------------------------------------------
 # PAGE CONFIG
 # -------------------------------------------------
@@ -145,6 +146,9 @@ if "active_chat" not in st.session_state:
 if "uploaded_context" not in st.session_state:
     st.session_state.uploaded_context = ""
 
+if "csv_job" not in st.session_state:
+    st.session_state.csv_job = None
+
 # -------------------------------------------------
 # SIDEBAR – CHAT HISTORY + DELETE
 # -------------------------------------------------
@@ -188,10 +192,33 @@ uploaded = st.sidebar.file_uploader(
 
 if uploaded:
     if uploaded.name.endswith(".csv"):
-        df = pd.read_csv(uploaded)
-        st.session_state.uploaded_context = df.head().to_string()
+        # Preview from the first chunk only; full statistics stream in the
+        # background and the job survives reruns until a new file arrives
+        job = st.session_state.csv_job
+        if job is None or job.source_id != uploaded.file_id:
+            from pandas.errors import EmptyDataError, ParserError
+
+            from utils.csv_ingest import CsvIngestJob
+
+            try:
+                job = CsvIngestJob(uploaded.getvalue(), uploaded.name, source_id=uploaded.file_id)
+            except (EmptyDataError, ParserError, UnicodeDecodeError) as exc:
+                job = None
+                st.session_state.uploaded_context = ""
+                st.sidebar.error(f"Could not read {uploaded.name}: {exc}")
+            else:
+                st.session_state.uploaded_context = job.preview.to_string()
+            st.session_state.csv_job = job
+
+        if job is not None and job.done:
+            st.sidebar.caption(f"✅ {job.rows:,} rows scanned")
+        elif job is not None:
+            st.sidebar.caption(f"⏳ Scanning… {job.rows:,} rows so far")
     elif uploaded.name.endswith(".txt"):
+        st.session_state.csv_job = None
         st.session_state.uploaded_context = uploaded.read().decode("utf-8")[:2000]
+else:
+    st.session_state.csv_job = None
 
 # -------------------------------------------------
 # HERO
@@ -219,9 +246,29 @@ def detect_intent(text):
         return "file"
     return "general"
 
+# Whole words that only make sense about a table. Everyday statistics
+# words (mean, average, min, max, missing) are left out: "what is the
+# average groundwater depth?" is a project question. Naming a column
+# still routes such questions to the file.
+FILE_QUESTION_WORDS = (
+    "file", "upload", "uploaded", "csv", "row", "rows", "column", "columns",
+    "null", "nulls"
+)
+
 def generate_reply(prompt):
     intent = detect_intent(prompt)
 
+    job = st.session_state.csv_job
+    if job is not None:
+        from utils.csv_ingest import describe, mentions
+
+        if any(mentions(prompt, word) for word in (*FILE_QUESTION_WORDS, *job.schema)):
+            return (
+                describe(job.summary(), prompt)
+                + "\n\nPreview:\n\n"
+                + st.session_state.uploaded_context[:600]
+            )
+
     if intent == "file" and st.session_state.uploaded_context:
         return (
             "Here is a preview from the uploaded file:\n\n"
@@ -287,3 +334,4 @@ model interpretation, and file-based Q&A.<br>
 © 2026 Groundwater Intelligence Platform
 </div>
 """, unsafe_allow_html=True)
+render_cache_panel()
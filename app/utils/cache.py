@@ -0,0 +1,124 @@
+import functools
+import threading
+from collections import defaultdict
+
+import streamlit as st
+
+from utils.path_fix import fix_path
+
+fix_path()
+
+# -------------------------------------------------
+# HIT / MISS ACCOUNTING
+# -------------------------------------------------
+# (page, cached function) -> [calls, misses]; process-wide, like the
+# Streamlit caches themselves
+_stats = defaultdict(lambda: [0, 0])
+_stats_lock = threading.Lock()
+
+PAGE_KEY = "_cache_page"
+
+def track_page(page):
+    """
+    Names the page for cache statistics; call once near the top.
+    """
+    st.session_state[PAGE_KEY] = page
+
+def _record(name, miss):
+    page = st.session_state.get(PAGE_KEY, "app")
+    with _stats_lock:
+        _stats[(page, name)][1 if miss else 0] += 1
+
+def cache_stats():
+    """
+    Rows of page, cache, calls, hits, hit_rate.
+    """
+    with _stats_lock:
+        items = sorted(_stats.items())
+    rows = []
+    for (page, name), (calls, misses) in items:
+        hits = max(calls - misses, 0)
+        rows.append({
+            "page": page,
+            "cache": name,
+            "calls": calls,
+            "hits": hits,
+            "hit_rate": f"{hits / calls:.0%}" if calls else "-"
+        })
+    return rows
+
+# -------------------------------------------------
+# DECORATOR
+# -------------------------------------------------
+def cached(kind="data", **options):
+    """
+    st.cache_data (kind="data", returns a copy per hit: safe for
+    figures that get mutated) or st.cache_resource (kind="resource",
+    one shared object: models) with hit counting. The arguments are the
+    cache key, so pass invalidation tokens (model version, last history
+    id) as arguments.
+    """
+    st_cache = st.cache_data if kind == "data" else st.cache_resource
+
+    def decorate(fn):
+        name = fn.__name__
+
+        @functools.wraps(fn)
+        def compute(*args, **kwargs):
+            _record(name, miss=True)
+            return fn(*args, **kwargs)
+
+        cached_compute = st_cache(show_spinner=False, **options)(compute)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            _record(name, miss=False)
+            return cached_compute(*args, **kwargs)
+
+        wrapper.clear = cached_compute.clear
+        return wrapper
+
+    return decorate
+
+# -------------------------------------------------
+# SHARED CACHED LOADERS
+# -------------------------------------------------
+@cached("resource", max_entries=2)
+def _lookup_grid(version):
+    from src.lookup_grid import get_lookup_grid
+
+    return get_lookup_grid()
+
+def lookup_grid():
+    """
+    Prediction lookup grid for the current model version.
+    """
+    from src.artifacts import model_version
+
+    return _lookup_grid(model_version())
+
+@cached("data", max_entries=4)
+def history_month_stats(last_id):
+    """
+    Per-month history aggregates as of history row last_id.
+    """
+    from utils.history_reader import get_history_reader
+
+    return get_history_reader().month_stats()
+
+# -------------------------------------------------
+# DEBUG PANEL
+# -------------------------------------------------
+def render_cache_panel():
+    """
+    Sidebar table of cache hit rates per page; shown to admins or with
+    ?debug=1 in the URL.
+    """
+    if not (st.session_state.get("is_admin") or st.query_params.get("debug") == "1"):
+        return
+    with st.sidebar.expander("🧪 Cache statistics"):
+        rows = cache_stats()
+        if rows:
+            st.table(rows)
+        else:
+            st.caption("No cached calls yet.")
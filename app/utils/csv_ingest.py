@@ -0,0 +1,176 @@
+import csv
+import io
+import re
+import threading
+
+import numpy as np
+
+# -------------------------------------------------
+# SETTINGS
+# -------------------------------------------------
+PREVIEW_ROWS = 5
+SNIFF_ROWS = 1_000        # rows parsed up front to infer the schema
+SNIFF_BYTES = 64 * 1024   # bytes handed to csv.Sniffer for the delimiter
+CHUNK_ROWS = 50_000       # rows per chunk in the background pass
+NUMERIC_SHARE = 0.95      # parseable share of sampled cells for a numeric column
+
+# -------------------------------------------------
+# PREVIEW (FIRST CHUNK ONLY)
+# -------------------------------------------------
+def _sniff_delimiter(head):
+    try:
+        return csv.Sniffer().sniff(head.decode("utf-8", errors="replace"), delimiters=",;\t|").delimiter
+    except csv.Error:
+        return ","
+
+def sniff_csv(data):
+    """
+    Parses only the first SNIFF_ROWS rows of a CSV held in memory.
+    Returns (preview_frame, schema, delimiter); schema maps column to
+    "numeric" or "text" as inferred from those rows.
+    """
+    import pandas as pd
+
+    delimiter = _sniff_delimiter(bytes(data[:SNIFF_BYTES]))
+    head = pd.read_csv(io.BytesIO(data), sep=delimiter, nrows=SNIFF_ROWS)
+    schema = {col: _column_kind(head[col]) for col in head.columns}
+    return head.head(PREVIEW_ROWS), schema, delimiter
+
+def _column_kind(values):
+    import pandas as pd
+
+    if pd.api.types.is_numeric_dtype(values.dtype):
+        return "numeric"
+    # A stray bad cell should not make a numeric column text
+    present = values.dropna()
+    parsed = pd.to_numeric(present, errors="coerce").notna().sum()
+    return "numeric" if len(present) and parsed / len(present) >= NUMERIC_SHARE else "text"
+
+# -------------------------------------------------
+# FULL-FILE STATISTICS (BACKGROUND, BOUNDED CHUNKS)
+# -------------------------------------------------
+class CsvIngestJob:
+    """
+    Streams a CSV in CHUNK_ROWS chunks on a background thread and keeps
+    running statistics: row count, nulls per column, and min/max/mean
+    for the columns the sniffed schema calls numeric (values that fail
+    to parse there count as nulls). Only one chunk is in memory at a time.
+    """
+
+    def __init__(self, data, name="upload.csv", source_id=None):
+        self.name = name
+        self.source_id = source_id
+        self.preview, self.schema, self.delimiter = sniff_csv(data)
+
+        self.rows = 0
+        self.nulls = {col: 0 for col in self.schema}
+        numeric = [col for col, kind in self.schema.items() if kind == "numeric"]
+        self._count = dict.fromkeys(numeric, 0)
+        self._sum = dict.fromkeys(numeric, 0.0)
+        self._min = dict.fromkeys(numeric, np.inf)
+        self._max = dict.fromkeys(numeric, -np.inf)
+
+        self.done = False
+        self.error = None
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, args=(data,), name="csv-ingest", daemon=True)
+        self._thread.start()
+
+    def _run(self, data):
+        import pandas as pd
+
+        try:
+            chunks = pd.read_csv(
+                io.BytesIO(data), sep=self.delimiter, chunksize=CHUNK_ROWS,
+                usecols=list(self.schema), dtype=str, keep_default_na=True
+            )
+            for chunk in chunks:
+                self._update(chunk)
+        except Exception as exc:
+            self.error = f"{type(exc).__name__}: {exc}"
+        finally:
+            self.done = True
+
+    def _update(self, chunk):
+        import pandas as pd
+
+        nulls = chunk.isna().sum()
+        stats = {}
+        for col in self._count:
+            values = pd.to_numeric(chunk[col], errors="coerce").to_numpy(dtype=np.float64)
+            valid = values[~np.isnan(values)]
+            stats[col] = (len(values) - len(valid), valid)
+
+        with self._lock:
+            self.rows += len(chunk)
+            for col in self.nulls:
+                self.nulls[col] += int(nulls[col])
+            for col, (unparsed, valid) in stats.items():
+                # nulls already counted; the rest failed numeric parsing
+                self.nulls[col] += unparsed - int(nulls[col])
+                if len(valid):
+                    self._count[col] += len(valid)
+                    self._sum[col] += float(valid.sum())
+                    self._min[col] = min(self._min[col], float(valid.min()))
+                    self._max[col] = max(self._max[col], float(valid.max()))
+
+    def wait(self, timeout=None):
+        self._thread.join(timeout)
+        return self.done
+
+    def summary(self):
+        """
+        Snapshot of the statistics so far (complete once done is True).
+        """
+        with self._lock:
+            columns = {}
+            for col, kind in self.schema.items():
+                entry = {"type": kind, "nulls": self.nulls[col]}
+                if kind == "numeric" and self._count[col]:
+                    entry.update(
+                        min=self._min[col],
+                        max=self._max[col],
+                        mean=self._sum[col] / self._count[col]
+                    )
+                columns[col] = entry
+            return {
+                "name": self.name,
+                "rows": self.rows,
+                "complete": self.done and self.error is None,
+                "error": self.error,
+                "columns": columns
+            }
+
+# -------------------------------------------------
+# ANSWERS
+# -------------------------------------------------
+def _describe_column(col, entry):
+    text = f"**{col}** ({entry['type']}): {entry['nulls']:,} missing"
+    if "mean" in entry:
+        text += f", min {entry['min']:.4g}, max {entry['max']:.4g}, mean {entry['mean']:.4g}"
+    return text
+
+def mentions(text, term):
+    """
+    True when term appears in text as a whole word (case-insensitive),
+    so "ph" does not match "phone" nor "date" "update".
+    """
+    return re.search(rf"(?<!\w){re.escape(term.lower())}(?!\w)", text.lower()) is not None
+
+def describe(summary, question=""):
+    """
+    Chat reply from a summary: the columns named in the question, or an
+    overview of the whole file.
+    """
+    status = "" if summary["complete"] else " (still scanning, figures so far)"
+    if summary["error"]:
+        status = f" (scan stopped: {summary['error']})"
+
+    named = [col for col in summary["columns"] if mentions(question, col)]
+    header = (
+        f"**{summary['name']}** has {summary['rows']:,} rows and "
+        f"{len(summary['columns'])} columns{status}."
+    )
+    columns = named or list(summary["columns"])
+    lines = [_describe_column(col, summary["columns"][col]) for col in columns]
+    return header + "\n\n" + "\n\n".join(lines)
@@ -0,0 +1,256 @@
+import argparse
+import time
+
+import numpy as np
+
+# -------------------------------------------------
+# POINT BUDGET
+# -------------------------------------------------
+CHART_WIDTH_PX = 1200    # wide-layout chart width when the real one is unknown
+POINTS_PER_PX = 1.0      # more than one point per pixel column is invisible
+MIN_POINTS = 50
+
+def point_budget(width_px=CHART_WIDTH_PX, points_per_px=POINTS_PER_PX):
+    """
+    Number of points worth sending for a chart width_px wide.
+    """
+    return max(MIN_POINTS, int(width_px * points_per_px))
+
+# -------------------------------------------------
+# LARGEST-TRIANGLE-THREE-BUCKETS
+# -------------------------------------------------
+def lttb_indices(x, y, n_out):
+    """
+    Indices kept by Steinarsson's Largest-Triangle-Three-Buckets:
+    per bucket, the point forming the largest triangle with the
+    previous pick and the next bucket's mean. First and last are kept.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # Interior points split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+
+    prev = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+
+        # Average of the next bucket (or the last point) as the third vertex
+        if i + 2 < len(edges):
+            nxt = slice(edges[i + 1], edges[i + 2])
+            cx, cy = x[nxt].mean(), y[nxt].mean()
+        else:
+            cx, cy = x[-1], y[-1]
+
+        ax, ay = x[prev], y[prev]
+        bx, by = x[start:stop], y[start:stop]
+        area = np.abs((ax - cx) * (by - ay) - (ax - bx) * (cy - ay))
+
+        prev = start + int(np.argmax(area))
+        keep[i + 1] = prev
+
+    return keep
+
+def lttb(x, y, n_out):
+    """
+    Downsamples a line to n_out points while keeping its visual shape.
+    Returns (x, y) arrays; inputs shorter than n_out are returned unchanged.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    keep = lttb_indices(x, y, n_out)
+    return x[keep], y[keep]
+
+# -------------------------------------------------
+# MIN/MAX DECIMATION
+# -------------------------------------------------
+def minmax_indices(y, n_out):
+    """
+    Indices of the min and max of each of n_out // 2 equal buckets, in
+    order. Cheaper than LTTB and never drops an extreme, so spikes and
+    envelopes survive exactly.
+    """
+    n = len(y)
+    n_buckets = n_out // 2
+    if n_out >= n or n_buckets < 1:
+        return np.arange(n)
+
+    # Equal buckets as rows of a 2-D view; the last one takes the remainder
+    y = np.asarray(y, dtype=np.float64)
+    size = n // n_buckets
+    tail_start = size * (n_buckets - 1)
+    body = y[:tail_start].reshape(n_buckets - 1, size)
+    offsets = np.arange(n_buckets - 1) * size
+    tail = y[tail_start:]
+
+    lows = np.append(offsets + body.argmin(axis=1), tail_start + tail.argmin())
+    highs = np.append(offsets + body.argmax(axis=1), tail_start + tail.argmax())
+    return np.unique(np.concatenate([lows, highs]))
+
+def minmax(x, y, n_out):
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    keep = minmax_indices(y, n_out)
+    return x[keep], y[keep]
+
+# -------------------------------------------------
+# STREAMING MIN/MAX (BOUNDED MEMORY)
+# -------------------------------------------------
+class StreamingMinMax:
+    """
+    Min/max envelope of an ever-growing series in at most max_buckets
+    buckets. extend() folds new values into the buckets; when there are
+    too many, neighbouring pairs merge and the bucket width doubles.
+    Memory is O(max_buckets) and an extend costs O(new values), so a
+    long history never has to be kept or rescanned.
+    """
+
+    def __init__(self, max_buckets=CHART_WIDTH_PX):
+        self.max_buckets = max(2, int(max_buckets))
+        self.size = 1      # points per bucket
+        self.count = 0     # points seen
+        self.first = None  # (index, value) of the oldest point
+        self.last = None   # ... and of the newest
+
+        # per bucket: index & value of its min and of its max
+        self._lo_i = np.empty(0, dtype=np.int64)
+        self._lo_y = np.empty(0, dtype=np.float64)
+        self._hi_i = np.empty(0, dtype=np.int64)
+        self._hi_y = np.empty(0, dtype=np.float64)
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        if not len(values):
+            return
+        idx = np.arange(self.count, self.count + len(values))
+        self.count += len(values)
+        if self.first is None:
+            self.first = (0, float(values[0]))
+        self.last = (int(idx[-1]), float(values[-1]))
+
+        # New values split by bucket (buckets are aligned on the index)
+        bucket = idx // self.size
+        starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+        lo, hi = _segment_argmin(values, starts), _segment_argmax(values, starts)
+        lo_i, lo_y, hi_i, hi_y = idx[lo], values[lo], idx[hi], values[hi]
+
+        # The first segment may continue the last, partly filled bucket
+        n = len(self._lo_i)
+        if n and bucket[0] == n - 1:
+            if lo_y[0] < self._lo_y[-1]:
+                self._lo_i[-1], self._lo_y[-1] = lo_i[0], lo_y[0]
+            if hi_y[0] > self._hi_y[-1]:
+                self._hi_i[-1], self._hi_y[-1] = hi_i[0], hi_y[0]
+            lo_i, lo_y, hi_i, hi_y = lo_i[1:], lo_y[1:], hi_i[1:], hi_y[1:]
+
+        self._lo_i = np.concatenate([self._lo_i, lo_i])
+        self._lo_y = np.concatenate([self._lo_y, lo_y])
+        self._hi_i = np.concatenate([self._hi_i, hi_i])
+        self._hi_y = np.concatenate([self._hi_y, hi_y])
+        while len(self._lo_i) > self.max_buckets:
+            self._merge_pairs()
+
+    def _merge_pairs(self):
+        if len(self._lo_i) % 2:
+            # odd count: the last bucket becomes a (partial) pair on its own
+            self._lo_i, self._lo_y = np.r_[self._lo_i, self._lo_i[-1]], np.r_[self._lo_y, self._lo_y[-1]]
+            self._hi_i, self._hi_y = np.r_[self._hi_i, self._hi_i[-1]], np.r_[self._hi_y, self._hi_y[-1]]
+
+        lo_y, hi_y = self._lo_y.reshape(-1, 2), self._hi_y.reshape(-1, 2)
+        rows = np.arange(len(lo_y))
+        lo_pick, hi_pick = lo_y.argmin(axis=1), hi_y.argmax(axis=1)
+        self._lo_i = self._lo_i.reshape(-1, 2)[rows, lo_pick]
+        self._lo_y = lo_y[rows, lo_pick]
+        self._hi_i = self._hi_i.reshape(-1, 2)[rows, hi_pick]
+        self._hi_y = hi_y[rows, hi_pick]
+        self.size *= 2
+
+    def points(self):
+        """
+        (index, value) of every kept point in index order: each bucket's
+        min and max plus the oldest and newest points.
+        """
+        if not self.count:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        i = np.concatenate([[self.first[0]], self._lo_i, self._hi_i, [self.last[0]]])
+        y = np.concatenate([[self.first[1]], self._lo_y, self._hi_y, [self.last[1]]])
+        i, first = np.unique(i, return_index=True)
+        return i, y[first]
+
+def _segment_argmin(values, starts):
+    return _segment_arg(values, starts, np.minimum)
+
+def _segment_argmax(values, starts):
+    return _segment_arg(values, starts, np.maximum)
+
+def _segment_arg(values, starts, ufunc):
+    # Position of each segment's extreme (first one on ties)
+    extremes = ufunc.reduceat(values, starts)
+    segment = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, len(values)]))
+    hits = np.flatnonzero(values == extremes[segment])
+    _, first = np.unique(segment[hits], return_index=True)
+    return hits[first]
+
+# -------------------------------------------------
+# ENTRY POINT FOR CHARTS
+# -------------------------------------------------
+METHODS = {"lttb": lttb, "minmax": minmax}
+
+def downsample(x, y, width_px=CHART_WIDTH_PX, method="lttb"):
+    """
+    (x, y) reduced to the point budget of a chart width_px wide.
+    Every line chart in the app goes through this.
+    """
+    return METHODS[method](x, y, point_budget(width_px))
+
+# -------------------------------------------------
+# BENCHMARK
+# -------------------------------------------------
+def _trend_figure(x, y):
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=x, y=y, mode="lines+markers"))
+    fig.add_trace(go.Scatter(
+        x=np.concatenate([x, x[::-1]]),
+        y=np.concatenate([y + 0.1, (y - 0.1)[::-1]]),
+        fill="toself"
+    ))
+    return fig
+
+def _payload(x, y):
+    start = time.perf_counter()
+    body = _trend_figure(x, y).to_json()
+    return len(body), time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Payload size of the trend chart with and without downsampling")
+    parser.add_argument("--points", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--width", type=int, default=CHART_WIDTH_PX)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    _payload(np.arange(3.0), np.zeros(3))  # import plotly outside the timings
+    print(f"Chart width {args.width}px -> budget {point_budget(args.width)} points")
+    print(f"{'points':>10} {'method':>8} {'kept':>6} {'payload KB':>11} {'reduce ms':>10} {'serialize ms':>13}")
+
+    for n in args.points:
+        x = np.arange(1, n + 1, dtype=np.float64)
+        y = 3.4 + np.cumsum(rng.normal(0, 0.02, n))
+
+        size, seconds = _payload(x, y)
+        print(f"{n:>10,} {'none':>8} {n:>6} {size / 1024:>11.1f} {0.0:>10.1f} {seconds * 1000:>13.1f}")
+
+        for method in METHODS:
+            start = time.perf_counter()
+            xs, ys = downsample(x, y, args.width, method)
+            reduce_s = time.perf_counter() - start
+            size, seconds = _payload(xs, ys)
+            print(f"{n:>10,} {method:>8} {len(xs):>6} {size / 1024:>11.1f} "
+                  f"{reduce_s * 1000:>10.1f} {seconds * 1000:>13.1f}")
+
+if __name__ == "__main__":
+    main()
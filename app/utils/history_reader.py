@@ -0,0 +1,121 @@
+import threading
+
+import numpy as np
+
+from utils.downsample import CHART_WIDTH_PX, StreamingMinMax, downsample, point_budget
+from utils.history_store import MONTHS, get_history_store
+
+MONTH_INDEX = {month: i for i, month in enumerate(MONTHS)}
+
+# Envelope buckets kept for the trend chart (2 points each)
+TREND_BUCKETS = point_budget(CHART_WIDTH_PX)
+
+# -------------------------------------------------
+# INCREMENTAL READER
+# -------------------------------------------------
+class IncrementalHistory:
+    """
+    Tails the prediction history store. refresh() only fetches rows
+    with an id above the last one seen, folds them into running
+    aggregates (count, mean, min/max, per-month stats) and a bounded
+    min/max envelope of the series, so a Dashboard rerun costs O(new
+    rows) and memory stays fixed however long the history grows.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._lock = threading.Lock()
+        self.last_id = 0
+
+        self.count = 0
+        self.total = 0.0
+        self.minimum = np.inf
+        self.maximum = -np.inf
+        self.last = None
+
+        # per month: count, sum, min, max
+        self._months = np.zeros((len(MONTHS), 4))
+        self._months[:, 2] = np.inf
+        self._months[:, 3] = -np.inf
+
+        self._trend = StreamingMinMax(TREND_BUCKETS)
+
+    def refresh(self):
+        """
+        Pulls new rows; returns how many arrived.
+        """
+        with self._lock:
+            new = self.store.tail(self.last_id)
+            if not new:
+                return 0
+
+            ids, months, values = zip(*new)
+            values = np.asarray(values, dtype=np.float64)
+            self.last_id = int(ids[-1])
+            self.count += len(values)
+            self.total += values.sum()
+            self.minimum = min(self.minimum, values.min())
+            self.maximum = max(self.maximum, values.max())
+            self.last = float(values[-1])
+            self._trend.extend(values)
+
+            month_idx = np.array([MONTH_INDEX.get(m, -1) for m in months])
+            known = month_idx >= 0
+            idx = month_idx[known]
+            vals = values[known]
+            np.add.at(self._months[:, 0], idx, 1)
+            np.add.at(self._months[:, 1], idx, vals)
+            np.minimum.at(self._months[:, 2], idx, vals)
+            np.maximum.at(self._months[:, 3], idx, vals)
+
+            return len(values)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def month_stats(self):
+        """
+        DataFrame indexed by month with count, mean, min, max
+        (months without predictions are omitted).
+        """
+        import pandas as pd  # only for the table, after the charts have rendered
+
+        counts, sums, mins, maxs = self._months.T
+        seen = counts > 0
+        return pd.DataFrame(
+            {
+                "count": counts[seen].astype(np.int64),
+                "mean": sums[seen] / counts[seen],
+                "min": mins[seen],
+                "max": maxs[seen]
+            },
+            index=pd.Index(np.array(MONTHS)[seen], name="month")
+        )
+
+    def series(self, width_px=CHART_WIDTH_PX, method="lttb"):
+        """
+        (index, prediction) for the trend chart, 1-based index,
+        downsampled to the point budget of a width_px-wide chart. Works
+        on the envelope (at most 2 * TREND_BUCKETS + 2 points), not the
+        full history.
+        """
+        index, values = self._trend.points()
+        return downsample(index + 1, values, width_px, method)
+
+# -------------------------------------------------
+# SHARED INSTANCE
+# -------------------------------------------------
+_reader = None
+_reader_lock = threading.Lock()
+
+def get_history_reader():
+    """
+    Process-wide reader, refreshed before it is returned.
+    """
+    global _reader
+    with _reader_lock:
+        if _reader is None:
+            _reader = IncrementalHistory(get_history_store())
+    _reader.refresh()
+    return _reader
@@ -0,0 +1,237 @@
+import csv
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+# -------------------------------------------------
+# PATHS
+# -------------------------------------------------
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DB_PATH = os.path.join(ROOT_DIR, "Data", "prediction_history.db")
+
+# Legacy CSV logs: the committed one, plus the one the Predict page used
+# to append to (lower-case data/ at the project root)
+LEGACY_CSV_PATHS = [
+    os.path.join(ROOT_DIR, "Data", "prediction_history.csv"),
+    os.path.join(ROOT_DIR, "data", "prediction_history.csv")
+]
+
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS predictions (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts           TEXT NOT NULL,
+    user         TEXT,
+    month        TEXT,
+    prediction_m REAL NOT NULL,
+    uid          TEXT UNIQUE  -- write-behind record id; NULL for direct appends
+);
+CREATE INDEX IF NOT EXISTS idx_predictions_ts ON predictions (ts);
+CREATE INDEX IF NOT EXISTS idx_predictions_user_ts ON predictions (user, ts);
+CREATE TABLE IF NOT EXISTS migrations (
+    source      TEXT PRIMARY KEY,
+    rows        INTEGER NOT NULL,
+    migrated_at TEXT NOT NULL
+);
+"""
+
+# -------------------------------------------------
+# STORE
+# -------------------------------------------------
+class HistoryStore:
+    """
+    Prediction history in SQLite (WAL mode).
+
+    WAL lets readers run alongside one writer and serializes concurrent
+    writers through SQLite's own lock (busy_timeout makes them wait
+    instead of failing). Each thread gets its own connection. Timestamps
+    are ISO-8601 text, so they sort and range-query through the index.
+    """
+
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    # ---------- writes ----------
+    def append(self, prediction_m, user=None, month=None, ts=None):
+        self.append_many([{"prediction_m": prediction_m, "user": user, "month": month, "ts": ts}])
+
+    def append_many(self, records):
+        """
+        records: iterable of dicts with prediction_m and optional
+        ts (datetime or ISO string), user, month, uid. One transaction;
+        records whose uid is already stored are skipped, so replays are safe.
+        """
+        conn = self._connect()
+        with conn:
+            return _insert_rows(conn, records)
+
+    # ---------- reads ----------
+    def query(self, start=None, end=None, user=None, limit=None, after_id=None):
+        """
+        Rows ordered by (ts, id) as a DataFrame with columns
+        id, ts, user, month, prediction_m. start/end bound ts
+        (inclusive / exclusive); limit keeps the most recent rows.
+        """
+        clauses, params = [], []
+        if start is not None:
+            clauses.append("ts >= ?")
+            params.append(_iso(start))
+        if end is not None:
+            clauses.append("ts < ?")
+            params.append(_iso(end))
+        if user is not None:
+            clauses.append("user = ?")
+            params.append(user)
+        if after_id is not None:
+            clauses.append("id > ?")
+            params.append(int(after_id))
+
+        import pandas as pd  # kept off the import path of pages that only write or tail
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = f"SELECT id, ts, user, month, prediction_m FROM predictions {where}"
+        if limit is not None:
+            sql = f"SELECT * FROM ({sql} ORDER BY ts DESC, id DESC LIMIT {int(limit)})"
+        sql += " ORDER BY ts, id"
+
+        return pd.read_sql_query(sql, self._connect(), params=params)
+
+    def tail(self, after_id=0):
+        """
+        (id, month, prediction_m) tuples with id > after_id, in id order.
+        """
+        return self._connect().execute(
+            "SELECT id, month, prediction_m FROM predictions WHERE id > ? ORDER BY id",
+            (int(after_id),)
+        ).fetchall()
+
+    def count(self, user=None):
+        if user is None:
+            row = self._connect().execute("SELECT COUNT(*) FROM predictions").fetchone()
+        else:
+            row = self._connect().execute(
+                "SELECT COUNT(*) FROM predictions WHERE user = ?", (user,)
+            ).fetchone()
+        return row[0]
+
+    # ---------- migration ----------
+    def migrate_csv(self, csv_path):
+        """
+        One-shot import of a legacy prediction_history.csv. Handles both
+        layouts found in the wild (Date,Predicted_Water_Level_m and
+        Month,Prediction_m), even mixed in one file. Rows without a
+        timestamp inherit the previous row's (or the file mtime), so the
+        original order survives. Re-running is a no-op.
+        """
+        import pandas as pd
+
+        source = os.path.abspath(csv_path)
+        if not os.path.exists(source):
+            return 0
+
+        last_ts = datetime.fromtimestamp(os.path.getmtime(source)).isoformat(sep=" ")
+        records = []
+        with open(source, newline="") as f:
+            for row in csv.reader(f):
+                if len(row) < 2:
+                    continue
+                first, value = row[0].strip(), row[1].strip()
+                try:
+                    prediction = float(value)
+                except ValueError:
+                    continue  # header line
+
+                if first in MONTHS:
+                    records.append({"ts": last_ts, "month": first, "prediction_m": prediction})
+                    continue
+                try:
+                    ts = pd.Timestamp(first)
+                except ValueError:
+                    continue
+                last_ts = ts.isoformat(sep=" ")
+                records.append({"ts": last_ts, "month": MONTHS[ts.month - 1], "prediction_m": prediction})
+
+        # BEGIN IMMEDIATE takes the write lock before the check, so two
+        # processes migrating at once cannot both import the file
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("SELECT 1 FROM migrations WHERE source = ?", (source,)).fetchone():
+                conn.rollback()
+                return 0
+            _insert_rows(conn, records)
+            conn.execute(
+                "INSERT INTO migrations (source, rows, migrated_at) VALUES (?, ?, ?)",
+                (source, len(records), datetime.now().isoformat(sep=" "))
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return len(records)
+
+def _insert_rows(conn, records):
+    now = datetime.now().isoformat(sep=" ")
+    rows = [
+        (
+            _iso(r.get("ts")) or now,
+            r.get("user"),
+            r.get("month"),
+            float(r["prediction_m"]),
+            r.get("uid")
+        )
+        for r in records
+    ]
+    cursor = conn.executemany(
+        "INSERT OR IGNORE INTO predictions (ts, user, month, prediction_m, uid) "
+        "VALUES (?, ?, ?, ?, ?)",
+        rows
+    )
+    return cursor.rowcount
+
+def _iso(value):
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return value
+    return value.isoformat(sep=" ")
+
+# -------------------------------------------------
+# SHARED INSTANCE
+# -------------------------------------------------
+_store = None
+_store_lock = threading.Lock()
+
+def get_history_store():
+    """
+    Process-wide store; legacy CSV logs are migrated on first use.
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = HistoryStore()
+            for path in LEGACY_CSV_PATHS:
+                _store.migrate_csv(path)
+        return _store
+
+if __name__ == "__main__":
+    store = HistoryStore()
+    for path in LEGACY_CSV_PATHS:
+        print(f"{path}: {store.migrate_csv(path)} rows migrated")
+    print(f"Total rows: {store.count()}")
@@ -0,0 +1,300 @@
+import atexit
+import glob
+import json
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+
+from utils.history_store import ROOT_DIR, get_history_store
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# -------------------------------------------------
+# SETTINGS
+# -------------------------------------------------
+# One journal per process, Data/prediction_history.<pid>.journal, locked
+# for as long as its writer is open
+JOURNAL_DIR = os.path.join(ROOT_DIR, "Data")
+JOURNAL_PREFIX = "prediction_history"
+
+MAX_BATCH = 200         # flush once this many records are waiting
+FLUSH_INTERVAL = 0.5    # ... or once the oldest has waited this long (s)
+
+_FLUSH = object()
+_STOP = object()
+
+def journal_path_for(journal_dir, pid):
+    return os.path.join(journal_dir, f"{JOURNAL_PREFIX}.{pid}.journal")
+
+# -------------------------------------------------
+# FILE LOCKS
+# -------------------------------------------------
+def _try_lock(f, blocking=False):
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+def _same_file(f, path):
+    # False once path was removed or replaced after f was opened
+    try:
+        return os.path.samestat(os.fstat(f.fileno()), os.stat(path))
+    except OSError:
+        return False
+
+def _read_records(f):
+    records = []
+    for line in f:
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            continue  # torn final line from a crash mid-write
+    return records
+
+# -------------------------------------------------
+# WRITE-BEHIND LOGGER
+# -------------------------------------------------
+class HistoryWriter:
+    """
+    Write-behind buffer in front of a HistoryStore.
+
+    append() only journals the record (one buffered line, no SQLite
+    transaction) and queues it; a background thread commits queued
+    records in batches. Every record carries a uid and the store ignores
+    duplicates, so a replay never double-counts.
+
+    Each process writes its own journal and holds a lock on it. On
+    start, journals whose lock is free (their process died) are
+    replayed into the store and removed; journals of live processes are
+    left alone.
+
+    durable=True fsyncs each journal line (survives power loss, not just
+    a crashed process) at the cost of a disk sync per append.
+    """
+
+    def __init__(self, store, journal_dir=JOURNAL_DIR, max_batch=MAX_BATCH,
+                 flush_interval=FLUSH_INTERVAL, durable=False):
+        self.store = store
+        self.journal_dir = journal_dir
+        self.journal_path = journal_path_for(journal_dir, os.getpid())
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.durable = durable
+
+        self._queue = queue.Queue()
+        self._journal_lock = threading.Lock()
+        self._pending = OrderedDict()  # uid -> journaled, not yet committed
+        self._closed = False
+
+        os.makedirs(journal_dir, exist_ok=True)
+        self.recovered = self._recover()
+        self._journal = self._open_journal()
+
+        self.batches = 0
+        self.records_written = 0
+
+        self._thread = threading.Thread(target=self._run, name="history-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _open_journal(self):
+        while True:
+            f = open(self.journal_path, "a+", encoding="utf-8")
+            _try_lock(f, blocking=True)
+            # A recovery may have removed the file while we waited
+            if _same_file(f, self.journal_path):
+                return f
+            f.close()
+
+    # ---------- producer side ----------
+    def append(self, prediction_m, user=None, month=None, ts=None):
+        """
+        Returns the record uid once it is journaled (acknowledged).
+        """
+        ts = datetime.now() if ts is None else ts
+        record = {
+            "uid": uuid.uuid4().hex,
+            "ts": ts if isinstance(ts, str) else ts.isoformat(sep=" "),
+            "user": user,
+            "month": month,
+            "prediction_m": float(prediction_m)
+        }
+        with self._journal_lock:
+            if self._closed:
+                raise RuntimeError("HistoryWriter is closed")
+            self._journal.write(json.dumps(record) + "\n")
+            self._journal.flush()
+            if self.durable:
+                os.fsync(self._journal.fileno())
+            self._pending[record["uid"]] = record
+        self._queue.put(record)
+        return record["uid"]
+
+    def flush(self, timeout=None):
+        """
+        Blocks until everything appended so far is committed.
+        """
+        done = threading.Event()
+        self._queue.put((_FLUSH, done))
+        return done.wait(timeout)
+
+    def close(self):
+        with self._journal_lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+        with self._journal_lock:
+            if not self._pending:
+                self._remove_journal(self._journal, self.journal_path)
+            self._journal.close()
+
+    # ---------- consumer side ----------
+    def _run(self):
+        batch, waiters = [], []
+        deadline = None
+        stopping = False
+
+        while not stopping:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                stopping = True
+            elif isinstance(item, tuple) and item[0] is _FLUSH:
+                waiters.append(item[1])
+            elif item is not None:
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+
+            due = deadline is not None and time.monotonic() >= deadline
+            if batch and (len(batch) >= self.max_batch or due or waiters or stopping):
+                if self._commit(batch):
+                    batch, deadline = [], None
+                elif not stopping:
+                    # Store busy or failing: retry on the next interval
+                    deadline = time.monotonic() + self.flush_interval
+            for event in waiters:
+                event.set()
+            waiters = []
+
+    def _commit(self, batch):
+        try:
+            self.store.append_many(batch)
+        except Exception:
+            # Records stay journaled; replayed on the next start at worst
+            return False
+        self.batches += 1
+        self.records_written += len(batch)
+
+        with self._journal_lock:
+            for record in batch:
+                self._pending.pop(record["uid"], None)
+            self._compact_journal()
+        return True
+
+    def _compact_journal(self):
+        """
+        Shrinks the journal to the uncommitted records (caller holds the
+        lock). The file is rewritten in place so the process keeps its
+        lock on it; the records are copied to <journal>.tmp first, and
+        recovery reads both, so a crash mid-rewrite loses nothing.
+        """
+        tmp_path = self.journal_path + ".tmp"
+        if self._pending:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for record in self._pending.values():
+                    f.write(json.dumps(record) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+        self._journal.seek(0)
+        self._journal.truncate()
+        for record in self._pending.values():
+            self._journal.write(json.dumps(record) + "\n")
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    # ---------- recovery ----------
+    def _recover(self):
+        """
+        Replays and removes the journals of processes that are gone.
+        """
+        recovered = 0
+        pattern = os.path.join(self.journal_dir, f"{JOURNAL_PREFIX}.*.journal")
+        for path in glob.glob(pattern):
+            try:
+                f = open(path, "r+", encoding="utf-8")
+            except OSError:
+                continue  # removed meanwhile
+            with f:
+                if not _try_lock(f) or not _same_file(f, path):
+                    continue  # owner still running, or someone else got here first
+                f.seek(0)
+                records = _read_records(f)
+                tmp_path = path + ".tmp"
+                if os.path.exists(tmp_path):
+                    with open(tmp_path, encoding="utf-8") as tmp:
+                        records += _read_records(tmp)
+
+                if records:
+                    recovered += self.store.append_many(records)
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                self._remove_journal(f, path)
+        return recovered
+
+    @staticmethod
+    def _remove_journal(f, path):
+        # Unlink while still holding the lock (POSIX); Windows cannot
+        # delete an open file, so there the caller's close comes first
+        # and the file is left for the next recovery
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def stats(self):
+        return {
+            "queued": len(self._pending),
+            "batches": self.batches,
+            "records_written": self.records_written,
+            "recovered": self.recovered
+        }
+
+# -------------------------------------------------
+# SHARED INSTANCE
+# -------------------------------------------------
+_writer = None
+_writer_lock = threading.Lock()
+
+def get_history_writer():
+    """
+    Process-wide writer over the shared history store.
+    """
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = HistoryWriter(get_history_store())
+        return _writer
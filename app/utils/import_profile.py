@@ -0,0 +1,175 @@
+import argparse
+import ast
+import glob
+import os
+import subprocess
+import sys
+
+# -------------------------------------------------
+# PATHS
+# -------------------------------------------------
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ROOT_DIR = os.path.dirname(APP_DIR)
+
+MARKER = "--- page imports: "
+
+def page_paths():
+    return [os.path.join(APP_DIR, "app.py")] + sorted(glob.glob(os.path.join(APP_DIR, "pages", "*.py")))
+
+# -------------------------------------------------
+# COLLECT
+# -------------------------------------------------
+# st.* calls that do not draw anything
+NON_RENDERING = {"session_state", "set_page_config", "cache_data", "cache_resource", "stop"}
+
+PHASES = ("startup", "deferred", "on demand")
+
+# Already imported by the Streamlit server before any page runs, so
+# loaded ahead of the first phase and not charged to the page
+PRELOADED = ("streamlit",)
+
+def _renders(node):
+    for call in ast.walk(node):
+        if not isinstance(call, ast.Call):
+            continue
+        func, attrs = call.func, []
+        while isinstance(func, ast.Attribute):
+            attrs.append(func.attr)
+            func = func.value
+        if isinstance(func, ast.Name) and func.id == "st" and attrs and attrs[-1] not in NON_RENDERING:
+            return True
+    return False
+
+def module_imports(path):
+    """
+    {phase: [module, ...]} for a page script, in execution order:
+      startup   - top-level imports before the page first draws anything
+      deferred  - top-level imports after it started drawing
+      on demand - imports inside if/try/with/loop blocks
+    Function and class bodies are skipped.
+    """
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    phases = {phase: [] for phase in PHASES}
+
+    def names(node):
+        if isinstance(node, ast.Import):
+            return [alias.name for alias in node.names]
+        if isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            # "module:name,..." so the profile imports submodules like `from` does
+            return [node.module + ":" + ",".join(alias.name for alias in node.names)]
+        return []
+
+    def nested(nodes):
+        for node in nodes:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda)):
+                continue
+            phases["on demand"].extend(names(node))
+            nested(ast.iter_child_nodes(node))
+
+    rendered = False
+    for node in tree.body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            phases["deferred" if rendered else "startup"].extend(names(node))
+            continue
+        nested(ast.iter_child_nodes(node))
+        # Only unconditional statements count; an `if` may never draw
+        # (e.g. the login gate)
+        if isinstance(node, (ast.Expr, ast.With)):
+            rendered = rendered or _renders(node)
+
+    seen = set()
+    for phase in PHASES:
+        phases[phase] = [m for m in dict.fromkeys(phases[phase]) if m not in seen]
+        seen.update(phases[phase])
+    return phases
+
+# -------------------------------------------------
+# PROFILE
+# -------------------------------------------------
+_SCRIPT = """
+import sys
+sys.path[:0] = [{app!r}, {root!r}]
+for name in {preloaded!r}:
+    __import__(name)
+for phase, modules in {phases!r}.items():
+    sys.stderr.write({marker!r} + phase + "\\n")
+    for name in modules:
+        module, _, fromlist = name.partition(":")
+        try:
+            __import__(module, fromlist=fromlist.split(",") if fromlist else ())
+        except Exception as exc:
+            print(f"{{name}}\\t{{type(exc).__name__}}: {{exc}}")
+"""
+
+def profile_imports(phases):
+    """
+    Imports PRELOADED, then each phase's modules in order, in one fresh
+    interpreter under -X importtime. Returns ({phase: rows}, failures): rows are
+    (module, self_us, cumulative_us, depth) for the imports a phase
+    triggered on top of earlier phases; failures maps module to the
+    error raised (e.g. a dependency not installed here).
+    """
+    script = _SCRIPT.format(
+        app=APP_DIR, root=ROOT_DIR, marker=MARKER, phases=phases, preloaded=PRELOADED
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        capture_output=True, text=True, cwd=APP_DIR
+    )
+
+    rows = {phase: [] for phase in phases}
+    phase = None
+    for line in result.stderr.splitlines():
+        if line.startswith(MARKER):
+            phase = line[len(MARKER):]
+            continue
+        if phase is None or not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # header line
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows[phase].append((name.strip(), int(fields[0]), int(fields[1]), depth))
+
+    failures = dict(
+        line.split("\t", 1) for line in result.stdout.splitlines() if "\t" in line
+    )
+    return rows, failures
+
+def summarize(rows, top=10):
+    """
+    Total import time (ms) and the heaviest top-level imports.
+    """
+    top_level = [(name, cumulative) for name, _, cumulative, depth in rows if depth == 0]
+    total_ms = sum(cumulative for _, cumulative in top_level) / 1000
+    heaviest = sorted(top_level, key=lambda r: r[1], reverse=True)[:top]
+    return total_ms, [(name, cumulative / 1000) for name, cumulative in heaviest]
+
+def main():
+    parser = argparse.ArgumentParser(description="Import cost of each Streamlit page, before and after it starts rendering")
+    parser.add_argument("--page", help="Only pages whose file name contains this")
+    parser.add_argument("--top", type=int, default=8, help="Heaviest imports to list per page")
+    args = parser.parse_args()
+
+    for path in page_paths():
+        name = os.path.basename(path)
+        if args.page and args.page.lower() not in name.lower():
+            continue
+
+        phases = module_imports(path)
+        rows, failures = profile_imports(phases)
+
+        print(f"\n{name}")
+        for phase in PHASES:
+            total_ms, heaviest = summarize(rows[phase], args.top)
+            print(f"  {phase:<10} {total_ms:8.1f} ms  ({len(phases[phase])} imports)")
+            for module, ms in heaviest:
+                print(f"    {ms:9.1f} ms  {module}")
+        for module, error in failures.items():
+            print(f"  (not importable here: {module} -> {error})")
+
+if __name__ == "__main__":
+    main()
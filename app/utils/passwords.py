@@ -0,0 +1,238 @@
+import argparse
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+# -------------------------------------------------
+# COST PARAMETERS
+# -------------------------------------------------
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COST_PATH = os.path.join(APP_DIR, "data", "password_cost.json")
+
+# Defaults; `python -m utils.passwords --write` replaces them with
+# values calibrated on this machine
+DEFAULT_COST = {
+    "scheme": "scrypt",
+    "n": 2 ** 14,     # CPU/memory cost (memory = 128 * n * r bytes)
+    "r": 8,
+    "p": 1,
+    "iterations": 600_000   # PBKDF2 fallback when OpenSSL lacks scrypt
+}
+SALT_BYTES = 16
+KEY_BYTES = 32
+
+LEGACY_SHA256_LENGTH = 64
+
+def _scrypt_available():
+    return hasattr(hashlib, "scrypt")
+
+def load_cost(path=COST_PATH):
+    cost = dict(DEFAULT_COST)
+    if os.path.exists(path):
+        with open(path, "r") as f:
+            cost.update(json.load(f))
+    if cost["scheme"] == "scrypt" and not _scrypt_available():
+        cost["scheme"] = "pbkdf2_sha256"
+    return cost
+
+_cost = None
+
+def current_cost():
+    global _cost
+    if _cost is None:
+        _cost = load_cost()
+    return _cost
+
+# -------------------------------------------------
+# KDFs
+# -------------------------------------------------
+def _scrypt(password, salt, n, r, p):
+    return hashlib.scrypt(
+        password.encode(), salt=salt, n=n, r=r, p=p,
+        maxmem=2 * 128 * n * r * p + 2 ** 20, dklen=KEY_BYTES
+    )
+
+def _pbkdf2(password, salt, iterations):
+    return hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations, dklen=KEY_BYTES)
+
+def hash_password(password, cost=None):
+    """
+    Salted hash, self-describing so cost changes never break old
+    entries: scrypt$n$r$p$salt$key or pbkdf2_sha256$iterations$salt$key.
+    """
+    cost = cost or current_cost()
+    salt = secrets.token_bytes(SALT_BYTES)
+    if cost["scheme"] == "scrypt":
+        key = _scrypt(password, salt, cost["n"], cost["r"], cost["p"])
+        return f"scrypt${cost['n']}${cost['r']}${cost['p']}${salt.hex()}${key.hex()}"
+    key = _pbkdf2(password, salt, cost["iterations"])
+    return f"pbkdf2_sha256${cost['iterations']}${salt.hex()}${key.hex()}"
+
+_dummy_hash = None
+
+def dummy_hash():
+    """
+    Hash of a random password at the current cost. Verifying against it
+    when an account does not exist costs the same as a real check, so
+    login timing does not reveal which emails are registered.
+    """
+    global _dummy_hash
+    if _dummy_hash is None:
+        _dummy_hash = hash_password(secrets.token_hex(16))
+    return _dummy_hash
+
+def _needs_rehash(stored, cost):
+    parts = stored.split("$")
+    if parts[0] != cost["scheme"]:
+        return True
+    if parts[0] == "scrypt":
+        return tuple(map(int, parts[1:4])) != (cost["n"], cost["r"], cost["p"])
+    return int(parts[1]) != cost["iterations"]
+
+def _verify_uncached(password, stored):
+    parts = stored.split("$")
+    if parts[0] == "scrypt" and len(parts) == 6:
+        n, r, p = map(int, parts[1:4])
+        key = _scrypt(password, bytes.fromhex(parts[4]), n, r, p)
+        return hmac.compare_digest(key.hex(), parts[5])
+    if parts[0] == "pbkdf2_sha256" and len(parts) == 4:
+        key = _pbkdf2(password, bytes.fromhex(parts[2]), int(parts[1]))
+        return hmac.compare_digest(key.hex(), parts[3])
+    if len(stored) == LEGACY_SHA256_LENGTH:
+        # Unsalted SHA-256 from before this module
+        digest = hashlib.sha256(password.encode()).hexdigest()
+        return hmac.compare_digest(digest, stored)
+    return False
+
+# -------------------------------------------------
+# VERIFICATION CACHE
+# -------------------------------------------------
+class VerificationCache:
+    """
+    Remembers recent successful verifications so Streamlit reruns and
+    repeat logins skip the KDF. Entries are HMACs under a per-process
+    random key (never the password), expire after ttl seconds, and are
+    bound to the stored hash, so a password change invalidates them.
+    """
+
+    def __init__(self, max_entries=1024, ttl=300.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._key = secrets.token_bytes(32)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _token(self, password, stored):
+        return hmac.new(self._key, f"{stored}\0{password}".encode(), hashlib.sha256).digest()
+
+    def hit(self, password, stored):
+        token = self._token(password, stored)
+        with self._lock:
+            expires = self._entries.get(token)
+            if expires is None:
+                return False
+            if expires < time.monotonic():
+                del self._entries[token]
+                return False
+            self._entries.move_to_end(token)
+            return True
+
+    def add(self, password, stored):
+        token = self._token(password, stored)
+        with self._lock:
+            self._entries[token] = time.monotonic() + self.ttl
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+verification_cache = VerificationCache()
+
+def verify_password(password, stored):
+    """
+    Returns (ok, needs_rehash). needs_rehash is True for legacy SHA-256
+    entries and for hashes made with different cost parameters; callers
+    store hash_password(password) after a successful login.
+    """
+    if not stored:
+        return False, False
+    cost = current_cost()
+    if verification_cache.hit(password, stored):
+        return True, _needs_rehash(stored, cost)
+
+    try:
+        ok = _verify_uncached(password, stored)
+    except ValueError:
+        ok = False  # malformed entry
+    if ok:
+        verification_cache.add(password, stored)
+    return ok, ok and _needs_rehash(stored, cost)
+
+# -------------------------------------------------
+# CALIBRATION
+# -------------------------------------------------
+def _time_hash(cost, rounds):
+    hash_password("calibration-password", cost)  # warm up
+    start = time.perf_counter()
+    for _ in range(rounds):
+        hash_password("calibration-password", cost)
+    return (time.perf_counter() - start) / rounds
+
+def calibrate(target_ms, scheme="scrypt", rounds=3, r=8, p=1):
+    """
+    Strongest cost whose single hash fits in target_ms here. Returns
+    (cost, [(cost, seconds), ...]) with every setting tried.
+    """
+    results = []
+    best = None
+    if scheme == "scrypt":
+        for log_n in range(12, 21):
+            cost = {**DEFAULT_COST, "scheme": "scrypt", "n": 2 ** log_n, "r": r, "p": p}
+            seconds = _time_hash(cost, rounds)
+            results.append((cost, seconds))
+            if seconds * 1000 > target_ms:
+                break
+            best = cost
+    else:
+        iterations = 50_000
+        while True:
+            cost = {**DEFAULT_COST, "scheme": "pbkdf2_sha256", "iterations": iterations}
+            seconds = _time_hash(cost, rounds)
+            results.append((cost, seconds))
+            if seconds * 1000 > target_ms:
+                break
+            best = cost
+            iterations *= 2
+    return best or results[0][0], results
+
+def main():
+    parser = argparse.ArgumentParser(description="Pick password hashing cost from a login latency budget")
+    parser.add_argument("--target-ms", type=float, default=100.0, help="Max time for one hash")
+    parser.add_argument("--scheme", choices=["scrypt", "pbkdf2_sha256"],
+                        default="scrypt" if _scrypt_available() else "pbkdf2_sha256")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--write", action="store_true", help=f"Save the pick to {COST_PATH}")
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    best, results = calibrate(args.target_ms, args.scheme, args.rounds)
+
+    print(f"{'cost':>24} {'ms/hash':>9} {'logins/s (all cores)':>21} {'memory/hash':>12}")
+    for cost, seconds in results:
+        label = (f"n=2^{cost['n'].bit_length() - 1} r={cost['r']} p={cost['p']}"
+                 if cost["scheme"] == "scrypt" else f"iterations={cost['iterations']:,}")
+        memory = f"{128 * cost['n'] * cost['r'] / 2 ** 20:.0f} MiB" if cost["scheme"] == "scrypt" else "-"
+        marker = "  <- pick" if cost == best else ""
+        print(f"{label:>24} {seconds * 1000:>9.1f} {cores / seconds:>21.1f} {memory:>12}{marker}")
+
+    if args.write:
+        with open(COST_PATH, "w") as f:
+            json.dump(best, f, indent=4)
+        print(f"Saved to {COST_PATH}")
+
+if __name__ == "__main__":
+    main()
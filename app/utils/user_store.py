@@ -0,0 +1,159 @@
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+# -------------------------------------------------
+# PATHS
+# -------------------------------------------------
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DB_PATH = os.path.join(APP_DIR, "data", "users.db")
+LEGACY_JSON_PATH = os.path.join(APP_DIR, "data", "users.json")
+
+USER_FIELDS = ("email", "password", "name", "role")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    email      TEXT PRIMARY KEY,
+    password   TEXT NOT NULL,
+    name       TEXT,
+    role       TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS migrations (
+    source      TEXT PRIMARY KEY,
+    rows        INTEGER NOT NULL,
+    migrated_at TEXT NOT NULL
+);
+"""
+
+# -------------------------------------------------
+# STORE
+# -------------------------------------------------
+class UserStore:
+    """
+    Accounts in SQLite (WAL mode), keyed by email.
+
+    The email primary key is a B-tree index, so lookups are O(log N)
+    and a sign-up is one row insert instead of a rewrite of every
+    account. Two sign-ups racing for the same email cannot both win:
+    the second insert fails on the key and create() returns False.
+    """
+
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    # ---------- reads ----------
+    def get(self, email):
+        """
+        User dict (email, password, name, role) or None.
+        """
+        row = self._connect().execute(
+            "SELECT email, password, name, role FROM users WHERE email = ?", (email,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def exists(self, email):
+        return self._connect().execute(
+            "SELECT 1 FROM users WHERE email = ?", (email,)
+        ).fetchone() is not None
+
+    def count(self):
+        return self._connect().execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    # ---------- writes ----------
+    def create(self, user):
+        """
+        Inserts one account; False if the email is already taken.
+        """
+        conn = self._connect()
+        try:
+            with conn:
+                _insert_users(conn, [user], "INSERT")
+        except sqlite3.IntegrityError:
+            return False
+        return True
+
+    def set_password(self, email, password_hash):
+        conn = self._connect()
+        with conn:
+            conn.execute("UPDATE users SET password = ? WHERE email = ?", (password_hash, email))
+
+    # ---------- migration ----------
+    def migrate_json(self, json_path):
+        """
+        One-shot import of the legacy users.json ({email: user}).
+        Accounts that already exist are kept; re-running is a no-op.
+        """
+        source = os.path.abspath(json_path)
+        if not os.path.exists(source):
+            return 0
+        with open(source, "r") as f:
+            users = json.load(f)
+
+        # Take the write lock before the check so concurrent processes
+        # cannot both import the file
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("SELECT 1 FROM migrations WHERE source = ?", (source,)).fetchone():
+                conn.rollback()
+                return 0
+            records = [{**user, "email": user.get("email", email)} for email, user in users.items()]
+            migrated = _insert_users(conn, records, "INSERT OR IGNORE")
+            conn.execute(
+                "INSERT INTO migrations (source, rows, migrated_at) VALUES (?, ?, ?)",
+                (source, migrated, datetime.now().isoformat(sep=" "))
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return migrated
+
+def _insert_users(conn, users, verb):
+    now = datetime.now().isoformat(sep=" ")
+    rows = [tuple(user.get(field) for field in USER_FIELDS) + (now,) for user in users]
+    cursor = conn.executemany(
+        f"{verb} INTO users (email, password, name, role, created_at) VALUES (?, ?, ?, ?, ?)",
+        rows
+    )
+    return cursor.rowcount
+
+# -------------------------------------------------
+# SHARED INSTANCE
+# -------------------------------------------------
+_store = None
+_store_lock = threading.Lock()
+
+def get_user_store():
+    """
+    Process-wide store; users.json is migrated on first use.
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = UserStore()
+            _store.migrate_json(LEGACY_JSON_PATH)
+        return _store
+
+if __name__ == "__main__":
+    store = UserStore()
+    print(f"{LEGACY_JSON_PATH}: {store.migrate_json(LEGACY_JSON_PATH)} users migrated")
+    print(f"Total users: {store.count()}")
@@ -0,0 +1,105 @@
+import hashlib
+import os
+import threading
+
+import joblib
+
+from src.fused_pipeline import FusedPipeline
+
+# ===============================
+# Paths
+# ===============================
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODEL_DIR = os.path.join(BASE_DIR, "model")
+MODEL_PATH = os.path.join(MODEL_DIR, "groundwater_model.pkl")
+SCALER_PATH = os.path.join(MODEL_DIR, "scaler.pkl")
+IMPUTER_PATH = os.path.join(MODEL_DIR, "imputer.pkl")
+FUSED_PATH = os.path.join(MODEL_DIR, "fused_pipeline.npz")
+
+# ===============================
+# Process-wide registry
+# ===============================
+# path -> {"stat": (mtime_ns, size), "sha256": str, "obj": object}
+_registry = {}
+_lock = threading.Lock()
+
+def _stat_signature(path):
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def load_artifact(path, loader=joblib.load):
+    """
+    Returns the object stored at path, deserialized with loader.
+
+    The object is loaded at most once per process. Each call only stats
+    the file; when mtime/size change the content hash decides whether
+    the artifact is actually reloaded (a plain `touch` keeps the cached
+    object).
+    """
+    path = os.path.abspath(path)
+    stat_sig = _stat_signature(path)
+
+    with _lock:
+        entry = _registry.get(path)
+        if entry is not None and entry["stat"] == stat_sig:
+            return entry["obj"]
+
+        sha = file_sha256(path)
+        if entry is not None and entry["sha256"] == sha:
+            entry["stat"] = stat_sig
+            return entry["obj"]
+
+        obj = loader(path)
+        _registry[path] = {"stat": stat_sig, "sha256": sha, "obj": obj}
+        return obj
+
+def artifact_version(path, loader=joblib.load):
+    """
+    Content hash of the currently loaded artifact (loads it if needed).
+    Useful as a cache key that changes only when the artifact does.
+    """
+    load_artifact(path, loader)
+    return _registry[os.path.abspath(path)]["sha256"]
+
+def model_version():
+    """
+    Content hashes of the model, scaler and imputer as one string; the
+    cache key for anything derived from the served model.
+    """
+    return "|".join(artifact_version(path) for path in (MODEL_PATH, SCALER_PATH, IMPUTER_PATH))
+
+def save_artifact(obj, path):
+    """
+    joblib.dump to a temp file renamed over path, so a process reloading
+    the artifact never unpickles a half-written file.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    joblib.dump(obj, tmp)
+    os.replace(tmp, path)
+
+def clear_artifacts():
+    with _lock:
+        _registry.clear()
+
+# ===============================
+# Shortcuts
+# ===============================
+def get_model():
+    return load_artifact(MODEL_PATH)
+
+def get_scaler():
+    return load_artifact(SCALER_PATH)
+
+def get_imputer():
+    return load_artifact(IMPUTER_PATH)
+
+def get_fused_pipeline():
+    return load_artifact(FUSED_PATH, FusedPipeline.load)
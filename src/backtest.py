@@ -0,0 +1,221 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+from sklearn.linear_model import Lasso, LinearRegression, Ridge
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from sklearn.neighbors import KNeighborsRegressor
+
+from src import feature_spec
+from src.artifacts import MODEL_DIR
+from src.dataset import DATA_PATH, load_dataset
+from src.preprocessing import TARGET_COL, extract_features
+
+# ===============================
+# Paths
+# ===============================
+FOLDS_DIR = os.path.join(MODEL_DIR, "backtest_folds")
+
+# ===============================
+# Model families
+# ===============================
+ESTIMATORS = {
+    "linear": LinearRegression,
+    "ridge": Ridge,
+    "lasso": Lasso,
+    "gbr": GradientBoostingRegressor,
+    "random_forest": RandomForestRegressor,
+    "knn": KNeighborsRegressor
+}
+
+def build_estimator(family, params):
+    estimator = ESTIMATORS[family](**params)
+    if "random_state" in estimator.get_params():
+        estimator.set_params(random_state=42)
+    return estimator
+
+# ===============================
+# Fold construction
+# ===============================
+def date_folds(dates, n_folds=5, mode="expanding", window=None, horizon=None, gap=0):
+    """
+    Walk-forward splits keyed on calendar dates.
+
+    dates: array-like of datetimes (any order, duplicates allowed)
+    mode: "expanding" -> train on everything before the test block
+          "rolling"   -> train on the last `window` dates only
+    window: training length in distinct dates (rolling mode)
+    horizon: test block length in distinct dates
+             (default: an equal share so n_folds blocks fit after one
+             block of initial training)
+    gap: distinct dates skipped between train and test
+
+    Rows sharing a date always land on the same side. Returns a list of
+    (train_idx, test_idx) positional index arrays.
+    """
+    dates = pd.to_datetime(pd.Series(dates), errors="coerce").to_numpy()
+    valid = ~pd.isna(dates)
+    order = np.flatnonzero(valid)[np.argsort(dates[valid], kind="stable")]
+    sorted_dates = dates[order]
+
+    unique_dates = np.unique(sorted_dates)
+    n_dates = len(unique_dates)
+    if horizon is None:
+        horizon = n_dates // (n_folds + 1)
+    if mode == "rolling" and window is None:
+        window = horizon
+    if mode not in ("expanding", "rolling"):
+        raise ValueError(f"Unknown mode: {mode}")
+
+    first_test = n_dates - n_folds * horizon
+    if horizon < 1 or first_test - gap < 1:
+        raise ValueError("Not enough distinct dates for the requested folds")
+
+    # Row boundaries of each distinct date in the sorted order
+    starts = np.searchsorted(sorted_dates, unique_dates, side="left")
+    bounds = np.append(starts, len(sorted_dates))
+
+    folds = []
+    for k in range(n_folds):
+        test_lo = first_test + k * horizon
+        test_hi = test_lo + horizon
+        train_hi = test_lo - gap
+        train_lo = 0 if mode == "expanding" else max(0, train_hi - window)
+
+        folds.append((
+            order[bounds[train_lo]:bounds[train_hi]],
+            order[bounds[test_lo]:bounds[test_hi]]
+        ))
+    return folds
+
+# ===============================
+# Per-fold preprocessing cache
+# ===============================
+def fold_path(folds_dir, fold, name):
+    return os.path.join(folds_dir, f"fold{fold}_{name}.npy")
+
+def prepare_fold_matrices(df, folds, folds_dir=FOLDS_DIR):
+    """
+    Fits imputer & scaler on each fold's training rows only (no leakage
+    from the test block) and stores the transformed arrays as .npy so
+    worker processes can memory-map them.
+    """
+    X_raw = extract_features(df)
+    y = df[TARGET_COL].to_numpy(dtype=np.float64)
+
+    os.makedirs(folds_dir, exist_ok=True)
+    for fold, (train_idx, test_idx) in enumerate(folds):
+        X_train, imputer, scaler = feature_spec.fit_transform(X_raw.iloc[train_idx])
+        X_test = feature_spec.transform(X_raw.iloc[test_idx], imputer, scaler)
+
+        np.save(fold_path(folds_dir, fold, "X_train"), X_train)
+        np.save(fold_path(folds_dir, fold, "y_train"), y[train_idx])
+        np.save(fold_path(folds_dir, fold, "X_test"), X_test)
+        np.save(fold_path(folds_dir, fold, "y_test"), y[test_idx])
+
+def load_fold(folds_dir, fold):
+    """
+    (X_train, y_train, X_test, y_test) as read-only memory maps.
+    """
+    return tuple(
+        np.load(fold_path(folds_dir, fold, name), mmap_mode="r")
+        for name in ("X_train", "y_train", "X_test", "y_test")
+    )
+
+def regression_metrics(y_true, y_pred):
+    return {
+        "rmse": float(np.sqrt(mean_squared_error(y_true, y_pred))),
+        "mae": float(mean_absolute_error(y_true, y_pred)),
+        "r2": float(r2_score(y_true, y_pred))
+    }
+
+# ===============================
+# Engine
+# ===============================
+def _run_fold(family, params, folds_dir, fold):
+    X_train, y_train, X_test, y_test = load_fold(folds_dir, fold)
+    model = build_estimator(family, params).fit(X_train, y_train)
+    y_pred = model.predict(X_test)
+    return fold, regression_metrics(y_test, y_pred), np.asarray(y_pred)
+
+def run_backtest(df, family="linear", params=None, n_folds=5, mode="expanding",
+                 window=None, horizon=None, gap=0, n_jobs=None, folds_dir=FOLDS_DIR):
+    """
+    Walk-forward backtest of one model family over df.
+
+    Returns (per_fold, summary): a DataFrame with one row per fold and a
+    dict holding the fold-mean metrics plus metrics pooled over every
+    test prediction.
+    """
+    folds = date_folds(df["Date"], n_folds, mode, window, horizon, gap)
+    prepare_fold_matrices(df, folds, folds_dir)
+
+    dates = pd.to_datetime(df["Date"], errors="coerce").to_numpy()
+    y = df[TARGET_COL].to_numpy(dtype=np.float64)
+
+    with ProcessPoolExecutor(max_workers=n_jobs or min(len(folds), os.cpu_count())) as pool:
+        outcomes = list(pool.map(
+            _run_fold,
+            [family] * len(folds),
+            [params or {}] * len(folds),
+            [folds_dir] * len(folds),
+            range(len(folds))
+        ))
+
+    rows = []
+    pooled_true = []
+    pooled_pred = []
+    for fold, metrics, y_pred in outcomes:
+        train_idx, test_idx = folds[fold]
+        rows.append({
+            "fold": fold,
+            "train_start": dates[train_idx].min(),
+            "train_end": dates[train_idx].max(),
+            "test_start": dates[test_idx].min(),
+            "test_end": dates[test_idx].max(),
+            "n_train": len(train_idx),
+            "n_test": len(test_idx),
+            **metrics
+        })
+        pooled_true.append(y[test_idx])
+        pooled_pred.append(y_pred)
+
+    per_fold = pd.DataFrame(rows)
+    summary = {
+        "mean": per_fold[["rmse", "mae", "r2"]].mean().to_dict(),
+        "pooled": regression_metrics(np.concatenate(pooled_true), np.concatenate(pooled_pred))
+    }
+    return per_fold, summary
+
+def main():
+    parser = argparse.ArgumentParser(description="Walk-forward backtest")
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--model", default="linear", choices=sorted(ESTIMATORS))
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--mode", choices=["expanding", "rolling"], default="expanding")
+    parser.add_argument("--window", type=int, default=None, help="rolling train length (distinct dates)")
+    parser.add_argument("--horizon", type=int, default=None, help="test length (distinct dates)")
+    parser.add_argument("--gap", type=int, default=0)
+    parser.add_argument("--jobs", type=int, default=None)
+    args = parser.parse_args()
+
+    per_fold, summary = run_backtest(
+        load_dataset(args.data),
+        args.model,
+        n_folds=args.folds,
+        mode=args.mode,
+        window=args.window,
+        horizon=args.horizon,
+        gap=args.gap,
+        n_jobs=args.jobs
+    )
+
+    print(per_fold.to_string(index=False))
+    for name, metrics in summary.items():
+        print(f"{name:>6}: RMSE {metrics['rmse']:.3f} | MAE {metrics['mae']:.3f} | R² {metrics['r2']:.3f}")
+
+if __name__ == "__main__":
+    main()
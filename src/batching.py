@@ -0,0 +1,130 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from src.predict import predict_groundwater_levels
+
+# ===============================
+# Settings
+# ===============================
+MAX_BATCH = 256
+MAX_WAIT_MS = 5.0
+
+# ===============================
+# Batching scheduler
+# ===============================
+class BatchScheduler:
+    """
+    Turns many concurrent single-reading calls into few vectorized ones.
+
+    submit() returns a concurrent.futures.Future immediately. A daemon
+    worker takes the first pending reading, keeps collecting until
+    max_batch readings are waiting or max_wait_ms has passed since that
+    first reading, then scores the whole group with one predict_fn call.
+    A caller therefore waits at most max_wait_ms plus one model call.
+    If that call raises, the readings are rescored one at a time so a
+    bad reading only fails its own future.
+    """
+
+    def __init__(self, predict_fn=predict_groundwater_levels,
+                 max_batch=MAX_BATCH, max_wait_ms=MAX_WAIT_MS):
+        self.predict_fn = predict_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+
+        self.batches = 0
+        self.rows = 0
+
+        self._queue = queue.SimpleQueue()
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, name="batch-scheduler", daemon=True)
+        self._worker.start()
+
+    def submit(self, record):
+        if self._closed:
+            raise RuntimeError("BatchScheduler is closed")
+        future = Future()
+        self._queue.put((record, future))
+        return future
+
+    def predict(self, record, timeout=None):
+        return self.submit(record).result(timeout)
+
+    def close(self, timeout=None):
+        """
+        Stops accepting work, lets already-submitted readings finish.
+        """
+        self._closed = True
+        self._queue.put(None)
+        self._worker.join(timeout)
+
+    def _collect(self):
+        first = self._queue.get()
+        if first is None:
+            return None
+
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+
+            batch = [(r, f) for r, f in batch if f.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            try:
+                predictions = self.predict_fn([record for record, _ in batch])
+            except Exception:
+                self._run_one_by_one(batch)
+                continue
+
+            self.batches += 1
+            self.rows += len(batch)
+            for (_, future), value in zip(batch, predictions):
+                future.set_result(float(value))
+
+    def _run_one_by_one(self, batch):
+        for record, future in batch:
+            try:
+                value = self.predict_fn([record])[0]
+            except Exception as exc:
+                future.set_exception(exc)
+                continue
+            self.batches += 1
+            self.rows += 1
+            future.set_result(float(value))
+
+# ===============================
+# Shared instance
+# ===============================
+_default = None
+_default_lock = threading.Lock()
+
+def get_scheduler():
+    """
+    Process-wide scheduler so every Streamlit session / thread feeds
+    the same batches.
+    """
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = BatchScheduler()
+        return _default
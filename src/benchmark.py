@@ -0,0 +1,64 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.dataset import DATA_PATH, load_dataset
+from src.predict import (
+    INPUT_COLUMNS,
+    predict_groundwater_level,
+    predict_groundwater_levels
+)
+
+def _sample_readings(n_rows):
+    """
+    Tiles the DWLR dataset up to n_rows so timings are comparable
+    across machines.
+    """
+    df = load_dataset(DATA_PATH)[INPUT_COLUMNS]
+    reps = int(np.ceil(n_rows / len(df)))
+    return pd.concat([df] * reps, ignore_index=True).iloc[:n_rows]
+
+def bench_batch_vs_scalar(n_rows=2000):
+    readings = _sample_readings(n_rows)
+
+    start = time.perf_counter()
+    scalar = np.array([
+        predict_groundwater_level(
+            row.Temperature_C,
+            row.Rainfall_mm,
+            row.pH,
+            row.Dissolved_Oxygen_mg_L,
+            row.Date,
+            use_cache=False
+        )
+        for row in readings.itertuples(index=False)
+    ])
+    scalar_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = predict_groundwater_levels(readings)
+    batch_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    fused = predict_groundwater_levels(readings, fused=True)
+    fused_s = time.perf_counter() - start
+
+    print(f"Rows          : {n_rows}")
+    print(f"Scalar path   : {scalar_s:.3f} s ({scalar_s / n_rows * 1e6:.1f} µs/row)")
+    print(f"Batch path    : {batch_s:.3f} s ({batch_s / n_rows * 1e6:.1f} µs/row)")
+    print(f"Fused path    : {fused_s:.3f} s ({fused_s / n_rows * 1e6:.1f} µs/row)")
+    print(f"Speed-up      : {scalar_s / batch_s:.1f}x (batch), {scalar_s / fused_s:.1f}x (fused)")
+    print(f"Max abs diff  : {np.max(np.abs(scalar - batch)):.2e} (batch), "
+          f"{np.max(np.abs(scalar - fused)):.2e} (fused)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Inference benchmarks")
+    parser.add_argument("--rows", type=int, default=2000)
+    args = parser.parse_args()
+
+    bench_batch_vs_scalar(args.rows)
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-import pandas as pd
+from src.dataset import load_dataset
 
-df = pd.read_csv("Data/DWLR_Dataset_2023.csv")
+df = load_dataset("Data/DWLR_Dataset_2023.csv")
 print(df["Water_Level_m"].describe())
@@ -0,0 +1,156 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.artifacts import file_sha256
+
+# ===============================
+# Paths
+# ===============================
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_PATH = os.path.join(BASE_DIR, "Data", "DWLR_Dataset_2023.csv")
+
+DATE_COL = "Date"
+META_FILE = "meta.json"
+
+# ===============================
+# Columnar cache
+# ===============================
+# <csv dir>/.cache/<csv name>/
+#     meta.json          source signature + column order/dtypes
+#     <column>.npy       one typed array per column (Date as datetime64)
+#     <column>.nulls.npy missing-value mask for text columns
+#
+# meta.json is written last and removed first, so a half-written cache
+# is never mistaken for a valid one.
+
+def cache_dir_for(csv_path):
+    csv_path = os.path.abspath(csv_path)
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(os.path.dirname(csv_path), ".cache", name)
+
+def _stat_signature(path):
+    st = os.stat(path)
+    return {"mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+def _read_meta(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, META_FILE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _write_meta(cache_dir, meta):
+    tmp = os.path.join(cache_dir, f"{META_FILE}.{os.getpid()}.tmp")
+    with open(tmp, "w") as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp, os.path.join(cache_dir, META_FILE))
+
+def _is_fresh(csv_path, cache_dir, meta):
+    """
+    Cheap mtime/size check first; on mismatch fall back to the content
+    hash so a touched-but-unchanged CSV does not force a rebuild.
+    """
+    if meta is None or "masked" not in meta:
+        return False  # missing, or written before text null masks existed
+
+    stat_sig = _stat_signature(csv_path)
+    if meta["source"]["stat"] == stat_sig:
+        return True
+
+    if meta["source"]["sha256"] == file_sha256(csv_path):
+        meta["source"]["stat"] = stat_sig
+        _write_meta(cache_dir, meta)
+        return True
+
+    return False
+
+def build_cache(csv_path):
+    """
+    Parses csv_path once and stores each column as a typed .npy file.
+    Returns the parsed DataFrame.
+    """
+    cache_dir = cache_dir_for(csv_path)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    meta_path = os.path.join(cache_dir, META_FILE)
+    if os.path.exists(meta_path):
+        os.remove(meta_path)
+
+    source = {"stat": _stat_signature(csv_path), "sha256": file_sha256(csv_path)}
+
+    df = pd.read_csv(csv_path)
+    if DATE_COL in df:
+        df[DATE_COL] = pd.to_datetime(df[DATE_COL], errors="coerce")
+
+    dtypes = {}
+    masked = []
+    for col in df.columns:
+        values = df[col].to_numpy()
+        if values.dtype == object:
+            # str() would store missing cells as the text "nan"
+            nulls = pd.isna(values)
+            values = np.where(nulls, "", values).astype(str)
+            _save_column(cache_dir, f"{col}.nulls", nulls)
+            masked.append(col)
+        dtypes[col] = values.dtype.str
+        _save_column(cache_dir, col, values)
+
+    _write_meta(cache_dir, {
+        "source": source,
+        "columns": list(df.columns),
+        "dtypes": dtypes,
+        "masked": masked
+    })
+    return df
+
+def _save_column(cache_dir, name, values):
+    tmp = os.path.join(cache_dir, f"{name}.{os.getpid()}.tmp.npy")
+    np.save(tmp, values, allow_pickle=False)
+    os.replace(tmp, os.path.join(cache_dir, f"{name}.npy"))
+
+def _load_column(cache_dir, col, masked):
+    values = np.load(os.path.join(cache_dir, f"{col}.npy"), mmap_mode="r")
+    if col not in masked:
+        return values
+    nulls = np.load(os.path.join(cache_dir, f"{col}.nulls.npy"))
+    return pd.Series(values).mask(nulls, np.nan)
+
+def source_fingerprint(csv_path=DATA_PATH):
+    """
+    Content hash of csv_path, answered from the cache metadata so only a
+    stat is needed while the CSV is unchanged.
+    """
+    cache_dir = cache_dir_for(csv_path)
+    meta = _read_meta(cache_dir)
+    if not _is_fresh(csv_path, cache_dir, meta):
+        build_cache(csv_path)
+        meta = _read_meta(cache_dir)
+    return meta["source"]["sha256"]
+
+def load_dataset(csv_path=DATA_PATH, use_cache=True):
+    """
+    csv_path: DWLR-style CSV
+    use_cache: True -> read the columnar cache, rebuilding it when the
+                       CSV changed
+               False -> parse the CSV directly
+    Returns a DataFrame with Date already parsed to datetime64.
+    """
+    if not use_cache:
+        df = pd.read_csv(csv_path)
+        if DATE_COL in df:
+            df[DATE_COL] = pd.to_datetime(df[DATE_COL], errors="coerce")
+        return df
+
+    cache_dir = cache_dir_for(csv_path)
+    meta = _read_meta(cache_dir)
+    if not _is_fresh(csv_path, cache_dir, meta):
+        return build_cache(csv_path)
+
+    masked = set(meta.get("masked", ()))
+    return pd.DataFrame({
+        col: _load_column(cache_dir, col, masked)
+        for col in meta["columns"]
+    })
@@ -1,58 +1,161 @@
+import argparse
+import json
 import os
-import joblib
-import matplotlib.pyplot as plt
-from sklearn.metrics import mean_squared_error, r2_score
 
-from src.preprocessing import load_and_preprocess_data
+import matplotlib
+import numpy as np
+import pandas as pd
+
+from src.artifacts import MODEL_PATH, load_artifact
+from src.backtest import regression_metrics, run_backtest
+from src.dataset import load_dataset
+from src.feature_store import load_feature_matrix
+from src.preprocessing import TARGET_COL, load_and_preprocess_data
 
 # ===============================
 # Paths
 # ===============================
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_PATH = os.path.join(BASE_DIR, "Data", "DWLR_Dataset_2023.csv")
-MODEL_PATH = os.path.join(BASE_DIR, "model", "groundwater_model.pkl")
-
-def main():
-    # Load data WITH y
-    X, y, _ = load_and_preprocess_data(DATA_PATH, training=True)
-
-    # Load trained model
-    model = joblib.load(MODEL_PATH)
-
-    # Predict
-    y_pred = model.predict(X)
-
-    # Metrics
-    rmse = mean_squared_error(y, y_pred, squared=False)
-    r2 = r2_score(y, y_pred)
+REPORTS_DIR = os.path.join(BASE_DIR, "reports")
 
-    print(f"RMSE: {rmse:.3f}")
-    print(f"R²  : {r2:.3f}")
+# Above this many points the scatter becomes a hexbin (bounded render time)
+MAX_SCATTER_POINTS = 20_000
 
-    # ===============================
-    # Actual vs Predicted
-    # ===============================
-    plt.figure(figsize=(6, 6))
-    plt.scatter(y, y_pred, alpha=0.5)
+# ===============================
+# Plots
+# ===============================
+def plot_actual_vs_predicted(plt, y, y_pred, max_points=MAX_SCATTER_POINTS):
+    fig = plt.figure(figsize=(6, 6))
+    if len(y) > max_points:
+        plt.hexbin(y, y_pred, gridsize=80, bins="log", mincnt=1, cmap="Blues")
+        plt.colorbar(label="Readings (log)")
+    else:
+        plt.scatter(y, y_pred, alpha=0.5)
     plt.plot([y.min(), y.max()], [y.min(), y.max()], "r--")
     plt.xlabel("Actual Groundwater Level (m)")
     plt.ylabel("Predicted Groundwater Level (m)")
     plt.title("Actual vs Predicted Groundwater Level")
     plt.grid(True)
-    plt.show()
+    return fig
 
-    # ===============================
-    # Residuals
-    # ===============================
-    residuals = y - y_pred
+def plot_residuals(plt, residuals):
+    # np.histogram bins once; drawing stays O(bins) whatever the row count
+    counts, edges = np.histogram(residuals, bins=30)
 
-    plt.figure(figsize=(6, 4))
-    plt.hist(residuals, bins=30)
+    fig = plt.figure(figsize=(6, 4))
+    plt.stairs(counts, edges, fill=True)
     plt.xlabel("Prediction Error (m)")
     plt.ylabel("Frequency")
     plt.title("Residual Distribution")
     plt.grid(True)
-    plt.show()
+    return fig
+
+def plot_monthly_error(plt, monthly):
+    fig = plt.figure(figsize=(7, 4))
+    plt.bar(monthly.index, monthly["rmse"], label="RMSE")
+    plt.plot(monthly.index, monthly["mae"], "o-", color="tab:orange", label="MAE")
+    plt.xticks(range(1, 13))
+    plt.xlabel("Month")
+    plt.ylabel("Error (m)")
+    plt.title("Prediction Error by Month")
+    plt.legend()
+    plt.grid(True, axis="y")
+    return fig
+
+def monthly_errors(dates, residuals):
+    months = pd.to_datetime(pd.Series(dates), errors="coerce").dt.month
+    frame = pd.DataFrame({"month": months.to_numpy(), "residual": residuals})
+    return frame.groupby("month")["residual"].agg(
+        rmse=lambda r: float(np.sqrt(np.mean(r ** 2))),
+        mae=lambda r: float(np.mean(np.abs(r))),
+        n="size"
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate the groundwater model")
+    parser.add_argument(
+        "--from-features",
+        action="store_true",
+        help="read the memory-mapped feature matrix instead of rebuilding it"
+    )
+    parser.add_argument(
+        "--backtest",
+        type=int,
+        metavar="FOLDS",
+        default=0,
+        help="also report out-of-sample walk-forward metrics over FOLDS folds"
+    )
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="render plots to files (Agg backend) and write metrics.json"
+    )
+    parser.add_argument("--out-dir", default=REPORTS_DIR)
+    parser.add_argument("--format", choices=["png", "svg"], default="png")
+    parser.add_argument("--max-points", type=int, default=MAX_SCATTER_POINTS)
+    args = parser.parse_args()
+
+    # Backend must be chosen before pyplot is imported
+    if args.headless:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    # Load data WITH y; the saved imputer & scaler belong to the model,
+    # so they are applied, never refitted
+    df = load_dataset(DATA_PATH)
+    if args.from_features:
+        X, y = load_feature_matrix(DATA_PATH)
+    else:
+        X, _, _ = load_and_preprocess_data(df, training=False)
+        y = df[TARGET_COL]
+    y = np.asarray(y, dtype=np.float64)
+
+    # Load trained model
+    model = load_artifact(MODEL_PATH)
+
+    # Predict
+    y_pred = model.predict(X)
+    residuals = y - y_pred
+
+    # Metrics
+    metrics = regression_metrics(y, y_pred)
+    monthly = monthly_errors(df["Date"], residuals)
+
+    print(f"RMSE: {metrics['rmse']:.3f}")
+    print(f"R²  : {metrics['r2']:.3f}")
+
+    report = {"n_rows": int(len(y)), "in_sample": metrics, "per_month": {
+        int(month): row for month, row in monthly.to_dict(orient="index").items()
+    }}
+
+    if args.backtest:
+        per_fold, summary = run_backtest(df, n_folds=args.backtest)
+        print("\nWalk-forward backtest (out-of-sample)")
+        print(per_fold.to_string(index=False))
+        pooled = summary["pooled"]
+        print(f"Pooled RMSE: {pooled['rmse']:.3f} | MAE: {pooled['mae']:.3f} | R²: {pooled['r2']:.3f}")
+        report["backtest"] = summary
+
+    figures = {
+        "actual_vs_predicted": plot_actual_vs_predicted(plt, y, y_pred, args.max_points),
+        "residuals": plot_residuals(plt, residuals),
+        "monthly_error": plot_monthly_error(plt, monthly)
+    }
+
+    if not args.headless:
+        plt.show()
+        return
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    for name, fig in figures.items():
+        fig.savefig(os.path.join(args.out_dir, f"{name}.{args.format}"), dpi=120, bbox_inches="tight")
+        plt.close(fig)
+
+    with open(os.path.join(args.out_dir, "metrics.json"), "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"📄 Report written to {args.out_dir}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+
+# ===============================
+# Declarative feature spec
+# ===============================
+# Single source of truth for what the model sees. Training, batch
+# scoring, the lookup grid and the Streamlit pages all compile their
+# inputs through this module instead of re-deriving features by hand.
+
+TARGET_COL = "Water_Level_m"
+DATE_COL = "Date"
+
+# Raw sensor inputs callers must provide (besides Date)
+SENSOR_INPUTS = {
+    "Temperature_C": "float64",
+    "Rainfall_mm": "float64",
+    "pH": "float64",
+    "Dissolved_Oxygen_mg_L": "float64"
+}
+
+# Derived features: name -> (dtype, function(parsed Date series))
+DERIVED_FEATURES = {
+    "DayOfYear": ("float64", lambda dates: dates.dt.dayofyear)
+}
+
+# Model column order and dtypes
+FEATURE_COLUMNS = list(SENSOR_INPUTS) + list(DERIVED_FEATURES)
+FEATURE_DTYPES = {
+    **SENSOR_INPUTS,
+    **{name: dtype for name, (dtype, _) in DERIVED_FEATURES.items()}
+}
+
+# Columns a caller hands in
+INPUT_COLUMNS = [DATE_COL] + list(SENSOR_INPUTS)
+
+# Applied in order after feature derivation
+PREPROCESSING_STEPS = (
+    ("impute", {"strategy": "median"}),
+    ("scale", {"with_mean": True, "with_std": True})
+)
+
+# Serving pages pick a month; it stands for the 15th of that month
+REFERENCE_YEAR = 2023
+REFERENCE_DAY = 15
+
+class FeatureSpecError(ValueError):
+    pass
+
+# ===============================
+# Validation
+# ===============================
+def validate_inputs(df):
+    """
+    Rejects raw input frames that cannot produce FEATURE_COLUMNS.
+    Only inspects column names and dtypes, never individual rows.
+    """
+    missing = [col for col in INPUT_COLUMNS if col not in df.columns]
+    if missing:
+        raise FeatureSpecError(f"Missing input columns: {missing}")
+
+    for col in SENSOR_INPUTS:
+        values = df[col]
+        if not pd.api.types.is_numeric_dtype(values.dtype) and not values.isna().all():
+            raise FeatureSpecError(f"{col} must be numeric, got {values.dtype}")
+
+def validate_features(X):
+    """
+    Rejects feature frames that are not exactly FEATURE_COLUMNS (in order).
+    Guards transform() against hand-built frames such as a Month column
+    in place of DayOfYear.
+    """
+    columns = list(getattr(X, "columns", []))
+    if columns != FEATURE_COLUMNS:
+        raise FeatureSpecError(f"Expected feature columns {FEATURE_COLUMNS}, got {columns}")
+
+# ===============================
+# Compilation
+# ===============================
+def build_features(df):
+    """
+    Raw (unimputed, unscaled) feature frame in FEATURE_COLUMNS order.
+    Does not modify df.
+    """
+    validate_inputs(df)
+    dates = pd.to_datetime(df[DATE_COL], errors="coerce")
+    derived = {name: fn(dates) for name, (_, fn) in DERIVED_FEATURES.items()}
+    return df.assign(**derived)[FEATURE_COLUMNS].astype(FEATURE_DTYPES)
+
+def month_day_of_year(month):
+    """
+    DayOfYear used for a month picked on a serving page (scalar or array).
+    """
+    table = np.array([
+        pd.Timestamp(REFERENCE_YEAR, m, REFERENCE_DAY).dayofyear for m in range(1, 13)
+    ])
+    return table[np.asarray(month, dtype=np.int64) - 1]
+
+def month_reading_date(month):
+    return pd.Timestamp(REFERENCE_YEAR, month, REFERENCE_DAY)
+
+# ===============================
+# Preprocessing steps
+# ===============================
+def make_preprocessors():
+    """
+    Unfitted (imputer, scaler) as declared in PREPROCESSING_STEPS.
+    sklearn is imported here so inference-only code can use the spec
+    without it.
+    """
+    from sklearn.impute import SimpleImputer
+    from sklearn.preprocessing import StandardScaler
+
+    params = dict(PREPROCESSING_STEPS)
+    return SimpleImputer(**params["impute"]), StandardScaler(**params["scale"])
+
+def fit_transform(X):
+    """
+    Training side: returns (X_scaled, imputer, scaler).
+    """
+    validate_features(X)
+    imputer, scaler = make_preprocessors()
+    X_scaled = scaler.fit_transform(imputer.fit_transform(X))
+    return X_scaled, imputer, scaler
+
+def transform(X, imputer, scaler):
+    """
+    Serving side: the exact same steps with fitted preprocessors.
+    """
+    validate_features(X)
+    return scaler.transform(imputer.transform(X))
@@ -0,0 +1,81 @@
+import json
+import os
+
+import numpy as np
+
+from src.artifacts import (
+    IMPUTER_PATH,
+    MODEL_DIR,
+    SCALER_PATH,
+    artifact_version
+)
+from src.dataset import DATA_PATH, load_dataset, source_fingerprint
+from src.preprocessing import TARGET_COL, load_and_preprocess_data
+
+# ===============================
+# Paths
+# ===============================
+FEATURES_PATH = os.path.join(MODEL_DIR, "features_X.npy")
+TARGET_PATH = os.path.join(MODEL_DIR, "features_y.npy")
+FEATURES_META_PATH = os.path.join(MODEL_DIR, "features_meta.json")
+
+# ===============================
+# Memory-mapped feature matrix
+# ===============================
+# The preprocessed (imputed + scaled) matrix is written once next to the
+# model artifacts and opened read-only with np.load(mmap_mode="r"), so
+# evaluation / retraining processes share one page-cache copy instead of
+# each rebuilding df.copy() -> X_imputed -> X_scaled.
+
+def _expected_meta(data_path):
+    return {
+        "source_sha256": source_fingerprint(data_path),
+        "imputer": artifact_version(IMPUTER_PATH),
+        "scaler": artifact_version(SCALER_PATH)
+    }
+
+def _atomic_save(path, array):
+    tmp = f"{path}.{os.getpid()}.tmp.npy"
+    np.save(tmp, np.ascontiguousarray(array), allow_pickle=False)
+    os.replace(tmp, path)
+
+def save_feature_matrix(X, y, data_path=DATA_PATH):
+    """
+    Persists X (scaled features) and y as .npy files. Call after the
+    imputer/scaler that produced X have been saved.
+    """
+    os.makedirs(MODEL_DIR, exist_ok=True)
+    if os.path.exists(FEATURES_META_PATH):
+        os.remove(FEATURES_META_PATH)
+
+    _atomic_save(FEATURES_PATH, np.asarray(X, dtype=np.float64))
+    _atomic_save(TARGET_PATH, np.asarray(y, dtype=np.float64))
+
+    with open(FEATURES_META_PATH, "w") as f:
+        json.dump(_expected_meta(data_path), f, indent=2)
+
+def feature_matrix_is_fresh(data_path=DATA_PATH):
+    """
+    True when the stored matrix was built from the current CSV with the
+    current imputer & scaler.
+    """
+    try:
+        with open(FEATURES_META_PATH) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return meta == _expected_meta(data_path)
+
+def load_feature_matrix(data_path=DATA_PATH, mmap_mode="r"):
+    """
+    Returns (X, y) as read-only memory maps, rebuilding them with the
+    saved imputer & scaler first if missing or stale.
+    """
+    if not feature_matrix_is_fresh(data_path):
+        df = load_dataset(data_path)
+        X, _, _ = load_and_preprocess_data(df, training=False)
+        save_feature_matrix(X, df[TARGET_COL], data_path)
+
+    X = np.load(FEATURES_PATH, mmap_mode=mmap_mode)
+    y = np.load(TARGET_PATH, mmap_mode=mmap_mode)
+    return X, y
@@ -0,0 +1,106 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from src import feature_spec
+
+# ===============================
+# Fused imputer + scaler + linear model
+# ===============================
+# With median fill m, scaling (x - mean) / scale and a linear model
+# (coef, intercept), the whole chain collapses to
+#
+#     y = fill(x, m) @ (coef / scale) + (intercept - coef @ (mean / scale))
+#
+# so inference is one NaN fill and one dot product, with no sklearn.
+
+class FusedPipeline:
+    def __init__(self, weights, bias, medians, feature_names):
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.bias = float(bias)
+        self.medians = np.asarray(medians, dtype=np.float64)
+        self.feature_names = [str(name) for name in feature_names]
+
+    @classmethod
+    def from_sklearn(cls, imputer, scaler, model, feature_names):
+        """
+        Folds fitted SimpleImputer(median), StandardScaler and a linear
+        model (coef_ / intercept_) into one weight vector and bias.
+        """
+        coef = np.ravel(model.coef_).astype(np.float64)
+        intercept = float(np.ravel(model.intercept_)[0])
+
+        mean = scaler.mean_ if scaler.with_mean else np.zeros_like(coef)
+        scale = scaler.scale_ if scaler.with_std else np.ones_like(coef)
+
+        weights = coef / scale
+        bias = intercept - weights @ mean
+
+        return cls(weights, bias, imputer.statistics_, feature_names)
+
+    # ---------- persistence ----------
+    def save(self, path):
+        # Same name np.savez would use; written aside and renamed so a
+        # concurrent load never sees a half-written file
+        if not path.endswith(".npz"):
+            path += ".npz"
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            np.savez(
+                f,
+                weights=self.weights,
+                bias=np.array(self.bias),
+                medians=self.medians,
+                feature_names=np.array(self.feature_names)
+            )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                data["weights"],
+                data["bias"],
+                data["medians"],
+                data["feature_names"]
+            )
+
+    # ---------- inference ----------
+    def predict(self, X):
+        """
+        X: raw feature matrix (n_rows, n_features) in feature_names order,
+           NaN marks a missing reading.
+        """
+        X = np.asarray(X, dtype=np.float64)
+        X = np.where(np.isnan(X), self.medians, X)
+        return X @ self.weights + self.bias
+
+    def predict_frame(self, df):
+        """
+        df: DataFrame with the spec's INPUT_COLUMNS; derived features
+        are compiled by src.feature_spec.
+        """
+        if self.feature_names != feature_spec.FEATURE_COLUMNS:
+            raise feature_spec.FeatureSpecError(
+                f"Pipeline was fused for {self.feature_names}, "
+                f"spec expects {feature_spec.FEATURE_COLUMNS}"
+            )
+        X = feature_spec.build_features(df).to_numpy(dtype=np.float64, na_value=np.nan)
+        return self.predict(X)
+
+def check_parity(fused, imputer, scaler, model, X_raw, atol=1e-9):
+    """
+    Raises AssertionError unless the fused pipeline reproduces the
+    sklearn reference chain on X_raw, including rows with missing values.
+    """
+    X_raw = np.asarray(X_raw, dtype=np.float64)
+
+    # Knock out one value per column so the NaN branch is exercised too
+    X_check = X_raw.copy()
+    for col in range(X_check.shape[1]):
+        X_check[col % len(X_check), col] = np.nan
+
+    X_frame = pd.DataFrame(X_check, columns=fused.feature_names)
+    reference = model.predict(scaler.transform(imputer.transform(X_frame)))
+    np.testing.assert_allclose(fused.predict(X_check), reference, rtol=0, atol=atol)
@@ -0,0 +1,143 @@
+import argparse
+import itertools
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from src import feature_spec
+from src.artifacts import (
+    MODEL_DIR,
+    get_imputer,
+    get_model,
+    get_scaler,
+    load_artifact,
+    model_version
+)
+
+# ===============================
+# Paths
+# ===============================
+GRID_PATH = os.path.join(MODEL_DIR, "prediction_grid.npz")
+
+# ===============================
+# Grid definition (Predict page sliders)
+# ===============================
+# (start, stop, step) per continuous input; months are exact indices
+GRID_AXES = {
+    "Temperature_C": (5.0, 45.0, 2.5),
+    "Rainfall_mm": (0.0, 300.0, 10.0),
+    "pH": (6.0, 8.5, 0.25),
+    "Dissolved_Oxygen_mg_L": (0.5, 10.0, 0.5)
+}
+
+def _axis_values(start, stop, step):
+    return np.round(np.arange(start, stop + step / 2, step), 10)
+
+# ===============================
+# Lookup grid
+# ===============================
+class LookupGrid:
+    """
+    Model predictions precomputed over the slider space as float32,
+    shape (12, n_temp, n_rain, n_ph, n_do). lookup() is an O(1) index
+    plus multilinear interpolation between the 16 surrounding nodes
+    (exact for the linear model).
+    """
+
+    def __init__(self, values, axes, model_version):
+        self.values = np.asarray(values, dtype=np.float32)
+        self.axes = [np.asarray(a, dtype=np.float64) for a in axes]
+        self.model_version = str(model_version)
+
+    @classmethod
+    def build(cls):
+        axes = [_axis_values(*GRID_AXES[col]) for col in GRID_AXES]
+
+        # Every (month, temp, rain, ph, do) node as one raw feature matrix
+        mesh = np.meshgrid(np.arange(12), *axes, indexing="ij")
+        raw = {
+            col: mesh[i + 1].ravel() for i, col in enumerate(GRID_AXES)
+        }
+        raw["DayOfYear"] = feature_spec.month_day_of_year(mesh[0].ravel() + 1)
+        X_raw = pd.DataFrame(raw)[feature_spec.FEATURE_COLUMNS].astype(feature_spec.FEATURE_DTYPES)
+
+        X_scaled = feature_spec.transform(X_raw, get_imputer(), get_scaler())
+        values = get_model().predict(X_scaled).astype(np.float32)
+
+        return cls(values.reshape(mesh[0].shape), axes, model_version())
+
+    # ---------- persistence ----------
+    def save(self, path=GRID_PATH):
+        # Written aside and renamed so a concurrent load never sees half a grid
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            np.savez(
+                f,
+                values=self.values,
+                model_version=np.array(self.model_version),
+                **{f"axis_{i}": axis for i, axis in enumerate(self.axes)}
+            )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path=GRID_PATH):
+        with np.load(path, allow_pickle=False) as data:
+            axes = [data[f"axis_{i}"] for i in range(len(GRID_AXES))]
+            return cls(data["values"], axes, data["model_version"])
+
+    # ---------- lookup ----------
+    def lookup(self, month, temperature, rainfall, ph, dissolved_oxygen):
+        """
+        month: 1-12. Other inputs are clipped to the grid range and
+        interpolated between nodes. Accepts scalars or equal-length arrays.
+        """
+        month_idx = np.asarray(month, dtype=np.int64) - 1
+        inputs = (temperature, rainfall, ph, dissolved_oxygen)
+
+        lower = []
+        frac = []
+        for axis, value in zip(self.axes, inputs):
+            value = np.clip(np.asarray(value, dtype=np.float64), axis[0], axis[-1])
+            pos = (value - axis[0]) / (axis[1] - axis[0])
+            idx = np.minimum(pos.astype(np.int64), len(axis) - 2)
+            lower.append(idx)
+            frac.append(pos - idx)
+
+        result = 0.0
+        for corner in itertools.product((0, 1), repeat=len(self.axes)):
+            weight = 1.0
+            index = [month_idx]
+            for bit, idx, f in zip(corner, lower, frac):
+                weight = weight * (f if bit else 1.0 - f)
+                index.append(idx + bit)
+            result = result + weight * self.values[tuple(index)]
+
+        return float(result) if np.ndim(result) == 0 else np.asarray(result)
+
+def get_lookup_grid():
+    """
+    Loads the saved grid once per process; rebuilds it when missing or
+    built from a different model.
+    """
+    if os.path.exists(GRID_PATH):
+        grid = load_artifact(GRID_PATH, LookupGrid.load)
+        if grid.model_version == model_version():
+            return grid
+
+    LookupGrid.build().save(GRID_PATH)
+    return load_artifact(GRID_PATH, LookupGrid.load)
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute the Predict page lookup grid")
+    parser.parse_args()
+
+    start = time.perf_counter()
+    grid = LookupGrid.build()
+    grid.save(GRID_PATH)
+    print(f"🧮 Grid {grid.values.shape} ({grid.values.nbytes / 1e6:.1f} MB) "
+          f"built in {time.perf_counter() - start:.2f} s -> {GRID_PATH}")
+
+if __name__ == "__main__":
+    main()
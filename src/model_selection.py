@@ -0,0 +1,151 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from src.artifacts import MODEL_DIR, save_artifact
+from src.backtest import (
+    build_estimator,
+    date_folds,
+    load_fold,
+    prepare_fold_matrices,
+    regression_metrics
+)
+from src import feature_spec
+from src.dataset import DATA_PATH, load_dataset
+from src.preprocessing import TARGET_COL, extract_features
+
+# ===============================
+# Paths
+# ===============================
+FOLDS_DIR = os.path.join(MODEL_DIR, "cv_folds")
+LEADERBOARD_PATH = os.path.join(MODEL_DIR, "leaderboard.csv")
+BEST_MODEL_PATH = os.path.join(MODEL_DIR, "best_model.pkl")
+# The winner's own preprocessors; model/scaler.pkl and model/imputer.pkl
+# belong to the production model
+BEST_SCALER_PATH = os.path.join(MODEL_DIR, "best_scaler.pkl")
+BEST_IMPUTER_PATH = os.path.join(MODEL_DIR, "best_imputer.pkl")
+
+# ===============================
+# Candidate grid
+# ===============================
+# (family, params) pairs so tasks stay cheap to pickle across processes
+CANDIDATES = (
+    [("linear", {})]
+    + [("ridge", {"alpha": a}) for a in (0.1, 1.0, 10.0, 100.0)]
+    + [("lasso", {"alpha": a}) for a in (0.001, 0.01, 0.1)]
+    + [
+        ("gbr", {"n_estimators": n, "max_depth": d, "learning_rate": 0.05})
+        for n in (100, 300) for d in (2, 3)
+    ]
+    + [
+        ("random_forest", {"n_estimators": 200, "max_depth": d})
+        for d in (None, 8)
+    ]
+    + [("knn", {"n_neighbors": k}) for k in (5, 15, 30)]
+)
+
+# ===============================
+# Shared fold cache
+# ===============================
+def prepare_folds(df, n_splits=5):
+    """
+    Builds expanding walk-forward folds on Date and preprocesses each one
+    once (imputer & scaler fitted on its training rows only). Workers
+    memory-map the cached arrays. Returns the number of folds written.
+    """
+    folds = date_folds(df["Date"], n_splits, mode="expanding")
+    prepare_fold_matrices(df, folds, FOLDS_DIR)
+    return len(folds)
+
+# ===============================
+# Worker
+# ===============================
+def _score_candidate_fold(family, params, fold):
+    X_train, y_train, X_val, y_val = load_fold(FOLDS_DIR, fold)
+
+    start = time.perf_counter()
+    model = build_estimator(family, params).fit(X_train, y_train)
+    fit_s = time.perf_counter() - start
+
+    metrics = regression_metrics(y_val, model.predict(X_val))
+    return {**metrics, "fit_s": fit_s}
+
+# ===============================
+# Search
+# ===============================
+def run_model_selection(data_path=DATA_PATH, n_splits=5, n_jobs=None,
+                        candidates=CANDIDATES):
+    """
+    Scores every candidate on every fold in a process pool and writes
+    the leaderboard plus the best model refitted on all rows.
+    """
+    df = load_dataset(data_path)
+    n_folds = prepare_folds(df, n_splits)
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=n_jobs or os.cpu_count()) as pool:
+        futures = {
+            pool.submit(_score_candidate_fold, family, params, fold): idx
+            for idx, (family, params) in enumerate(candidates)
+            for fold in range(n_folds)
+        }
+        for future in as_completed(futures):
+            results.setdefault(futures[future], []).append(future.result())
+
+    rows = []
+    for idx, (family, params) in enumerate(candidates):
+        scores = pd.DataFrame(results[idx])
+        rows.append({
+            "model": family,
+            "params": params,
+            "rmse": scores["rmse"].mean(),
+            "rmse_std": scores["rmse"].std(ddof=0),
+            "mae": scores["mae"].mean(),
+            "r2": scores["r2"].mean(),
+            "fit_s": scores["fit_s"].sum()
+        })
+
+    leaderboard = (
+        pd.DataFrame(rows)
+        .sort_values("rmse", kind="stable")
+        .reset_index(drop=True)
+    )
+    leaderboard.to_csv(LEADERBOARD_PATH, index_label="rank")
+
+    # Refit the winner on all rows with preprocessors of its own
+    best = leaderboard.iloc[0]
+    X, imputer, scaler = feature_spec.fit_transform(extract_features(df))
+    best_model = build_estimator(best["model"], best["params"]).fit(X, df[TARGET_COL])
+    save_artifact(best_model, BEST_MODEL_PATH)
+    save_artifact(scaler, BEST_SCALER_PATH)
+    save_artifact(imputer, BEST_IMPUTER_PATH)
+
+    return leaderboard
+
+def add_arguments(parser, data_default=DATA_PATH):
+    # As a subcommand pass argparse.SUPPRESS so a --data given before
+    # the subcommand is not overwritten by this default
+    parser.add_argument("--data", default=data_default)
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: all cores)")
+
+def run_from_args(args):
+    print(f"🔎 Evaluating {len(CANDIDATES)} candidates x {args.folds} folds...")
+    leaderboard = run_model_selection(args.data, args.folds, args.jobs)
+
+    print(leaderboard.to_string(index=False))
+    print(f"\n🏆 Best: {leaderboard.iloc[0]['model']} {leaderboard.iloc[0]['params']}")
+    print(f"Leaderboard   : {LEADERBOARD_PATH}")
+    print(f"Best model    : {BEST_MODEL_PATH}")
+    print(f"Preprocessors : {BEST_SCALER_PATH}, {BEST_IMPUTER_PATH}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel model selection")
+    add_arguments(parser)
+    run_from_args(parser.parse_args())
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,78 @@
-import os
-import joblib
+from collections.abc import Mapping
+
+import numpy as np
 import pandas as pd
 
+from src.artifacts import get_fused_pipeline, get_model
+from src.feature_spec import INPUT_COLUMNS
+from src.prediction_cache import prediction_cache
 from src.preprocessing import load_and_preprocess_data
 
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-MODEL_PATH = os.path.join(BASE_DIR, "model", "groundwater_model.pkl")
+def _to_input_frame(data):
+    """
+    data: DataFrame, dict of column -> array, or iterable of records (dicts)
+    Returns a DataFrame with INPUT_COLUMNS only.
+    """
+    if isinstance(data, pd.DataFrame):
+        return data[INPUT_COLUMNS]
+
+    if isinstance(data, Mapping):
+        return pd.DataFrame({
+            col: np.atleast_1d(np.asarray(data[col]))
+            for col in INPUT_COLUMNS
+        })
+
+    return pd.DataFrame.from_records(iter(data), columns=INPUT_COLUMNS)
+
+def predict_groundwater_levels(data, fused=False):
+    """
+    Batch inference: one imputer -> scaler -> model pass for all rows.
+
+    data: DataFrame, dict of column -> array, or iterable of records
+          keyed by INPUT_COLUMNS
+    fused: True -> use the exported NumPy pipeline (single dot product)
+           False -> sklearn reference chain
+    Returns a float64 NumPy array with one prediction per row.
+    """
+    input_df = _to_input_frame(data)
+    if input_df.empty:
+        return np.empty(0, dtype=np.float64)
+
+    if fused:
+        return get_fused_pipeline().predict_frame(input_df)
 
-model = joblib.load(MODEL_PATH)
+    X_scaled, _, _ = load_and_preprocess_data(
+        input_df,
+        training=False
+    )
+
+    return np.asarray(get_model().predict(X_scaled), dtype=np.float64)
 
 def predict_groundwater_level(
     temperature,
     rainfall,
     ph,
     dissolved_oxygen,
-    date
+    date,
+    use_cache=True
 ):
+    """
+    Single reading. With use_cache, inputs are quantized to the slider
+    steps and repeated readings are answered from the LRU cache.
+    """
+    if use_cache:
+        record = {
+            "Date": date,
+            "Temperature_C": temperature,
+            "Rainfall_mm": rainfall,
+            "pH": ph,
+            "Dissolved_Oxygen_mg_L": dissolved_oxygen
+        }
+        return prediction_cache.get_or_compute(
+            record,
+            lambda rep: predict_groundwater_levels([rep])[0]
+        )
+
     input_df = pd.DataFrame({
         "Date": [date],
         "Temperature_C": [temperature],
@@ -29,4 +86,4 @@ def predict_groundwater_level(
         training=False
     )
 
-    return float(model.predict(X_scaled)[0])
+    return float(get_model().predict(X_scaled)[0])
@@ -0,0 +1,149 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+from src.artifacts import model_version
+
+# ===============================
+# Settings
+# ===============================
+MAX_ENTRIES = 4096
+TTL_SECONDS = 3600.0
+
+# Representative dates are rebuilt in a leap year so every day of year,
+# 366 included, maps back to itself
+LEAP_REFERENCE_YEAR = 2024
+
+# Quantization step per input, matching the Predict page sliders
+# (Streamlit float sliders move in 0.01 steps by default)
+INPUT_STEPS = {
+    "Temperature_C": 0.01,
+    "Rainfall_mm": 0.01,
+    "pH": 0.01,
+    "Dissolved_Oxygen_mg_L": 0.01
+}
+
+def _quantize(value, step):
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    return int(round(float(value) / step))
+
+def quantize_reading(record):
+    """
+    Cache key for one reading. The model only sees the day of year, so
+    dates that share it share a key; a missing or unparseable date
+    (imputed by the model) gets the key None.
+    """
+    date = pd.to_datetime(record["Date"], errors="coerce")
+    day = None if pd.isna(date) else int(date.dayofyear)
+    return (day,) + tuple(
+        _quantize(record[col], step) for col, step in INPUT_STEPS.items()
+    )
+
+def dequantize_reading(key):
+    """
+    Representative reading for a key (a day in LEAP_REFERENCE_YEAR), so
+    every input that maps to a key gets the same prediction.
+    """
+    day, *levels = key
+    if day is None:
+        record = {"Date": pd.NaT}
+    else:
+        record = {"Date": pd.Timestamp(LEAP_REFERENCE_YEAR, 1, 1) + pd.Timedelta(days=day - 1)}
+    for (col, step), level in zip(INPUT_STEPS.items(), levels):
+        record[col] = float("nan") if level is None else round(level * step, 10)
+    return record
+
+# ===============================
+# Bounded LRU + TTL cache
+# ===============================
+class PredictionCache:
+    """
+    Thread-safe LRU cache of predictions keyed on quantized inputs.
+    Entries expire after ttl seconds; the whole cache is flushed when
+    any model artifact changes on disk.
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES, ttl=TTL_SECONDS, version_fn=model_version):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.version_fn = version_fn
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.flushes = 0
+
+    def _check_version(self):
+        version = self.version_fn()
+        if version != self._version:
+            if self._version is not None:
+                self.flushes += 1
+            self._entries.clear()
+            self._version = version
+
+    def get(self, record):
+        """
+        (key, cached value or None). On None, compute the prediction for
+        dequantize_reading(key) and hand it to put(key, value).
+        """
+        key = quantize_reading(record)
+        now = time.monotonic()
+
+        with self._lock:
+            self._check_version()
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires = entry
+                if expires > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return key, value
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+        return key, None
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (float(value), time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, record, compute_fn):
+        """
+        compute_fn(representative_record) -> float is only called on a miss.
+        """
+        key, value = self.get(record)
+        if value is None:
+            value = float(compute_fn(dequantize_reading(key)))
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "flushes": self.flushes
+        }
+
+prediction_cache = PredictionCache()
@@ -1,29 +1,31 @@
+import numpy as np
 import pandas as pd
-import joblib
-import os
 
-from sklearn.preprocessing import StandardScaler
-from sklearn.impute import SimpleImputer
+from src import feature_spec
+from src.artifacts import SCALER_PATH, IMPUTER_PATH, get_imputer, get_scaler, save_artifact
+from src.dataset import load_dataset
 
 # ===============================
-# Paths
+# Columns (defined by the shared feature spec)
 # ===============================
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-SCALER_PATH = os.path.join(BASE_DIR, "model", "scaler.pkl")
-IMPUTER_PATH = os.path.join(BASE_DIR, "model", "imputer.pkl")
+TARGET_COL = feature_spec.TARGET_COL
+FEATURE_COLUMNS = feature_spec.FEATURE_COLUMNS
 
 # ===============================
-# Columns
+# Streaming settings
 # ===============================
-TARGET_COL = "Water_Level_m"
+DEFAULT_CHUNKSIZE = 50_000
+RESERVOIR_SIZE = 100_000
 
-FEATURE_COLUMNS = [
-    "Temperature_C",
-    "Rainfall_mm",
-    "pH",
-    "Dissolved_Oxygen_mg_L",
-    "DayOfYear"
-]
+# ===============================
+# Feature extraction
+# ===============================
+def extract_features(df):
+    """
+    Raw (unimputed, unscaled) feature frame in FEATURE_COLUMNS order.
+    Does not modify df.
+    """
+    return feature_spec.build_features(df)
 
 # ===============================
 # Core preprocessing
@@ -35,42 +37,118 @@ def load_and_preprocess_data(data, training=True):
               False -> load saved ones
     """
 
-    # Load data
+    # Load data (columnar cache, rebuilt when the CSV changes)
     if isinstance(data, str):
-        df = pd.read_csv(data)
+        df = load_dataset(data)
     else:
-        df = data.copy()
-
-    # ---- Date handling ----
-    df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
-    df["DayOfYear"] = df["Date"].dt.dayofyear
+        df = data
 
     # ---- Features ----
-    X = df[FEATURE_COLUMNS]
+    X = extract_features(df)
 
     if training:
         y = df[TARGET_COL]
 
-        # ---- Handle missing values ----
-        imputer = SimpleImputer(strategy="median")
-        X_imputed = imputer.fit_transform(X)
-
-        # ---- Scaling ----
-        scaler = StandardScaler()
-        X_scaled = scaler.fit_transform(X_imputed)
+        # ---- Impute + scale, as declared in the feature spec ----
+        X_scaled, imputer, scaler = feature_spec.fit_transform(X)
 
         # Save artifacts
-        os.makedirs(os.path.dirname(SCALER_PATH), exist_ok=True)
-        joblib.dump(scaler, SCALER_PATH)
-        joblib.dump(imputer, IMPUTER_PATH)
+        save_artifact(scaler, SCALER_PATH)
+        save_artifact(imputer, IMPUTER_PATH)
 
         return X_scaled, y, scaler
 
     else:
-        imputer = joblib.load(IMPUTER_PATH)
-        scaler = joblib.load(SCALER_PATH)
-
-        X_imputed = imputer.transform(X)
-        X_scaled = scaler.transform(X_imputed)
+        scaler = get_scaler()
+        X_scaled = feature_spec.transform(X, get_imputer(), scaler)
 
         return X_scaled, None, scaler
+
+# ===============================
+# Streaming (chunked) preprocessing
+# ===============================
+class ReservoirSampler:
+    """
+    Uniform fixed-size sample of rows seen so far (Algorithm R,
+    vectorized per chunk). Its column medians approximate the medians
+    of the full stream in bounded memory.
+    """
+
+    def __init__(self, size=RESERVOIR_SIZE, seed=0):
+        self.size = size
+        self.seen = 0
+        self._rng = np.random.default_rng(seed)
+        self._rows = None
+        self._filled = 0
+
+    def update(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        if self._rows is None:
+            self._rows = np.empty((self.size, X.shape[1]), dtype=np.float64)
+
+        # Fill phase: copy rows straight in until the reservoir is full
+        take = min(self.size - self._filled, len(X))
+        self._rows[self._filled:self._filled + take] = X[:take]
+        self._filled += take
+        self.seen += take
+
+        # Replacement phase: row t survives with probability size / (t + 1).
+        # Duplicate slots keep the last writer, as the sequential loop would.
+        rest = X[take:]
+        if len(rest):
+            t = self.seen + np.arange(len(rest))
+            slots = self._rng.integers(0, t + 1)
+            keep = slots < self.size
+            self._rows[slots[keep]] = rest[keep]
+            self.seen += len(rest)
+
+    @property
+    def sample(self):
+        return self._rows[:self._filled]
+
+def iter_csv_chunks(path, chunksize=DEFAULT_CHUNKSIZE):
+    return pd.read_csv(path, chunksize=chunksize)
+
+def fit_streaming_preprocessors(path, chunksize=DEFAULT_CHUNKSIZE,
+                                reservoir_size=RESERVOIR_SIZE):
+    """
+    Fits imputer & scaler over a CSV of any size in two bounded passes:
+      1. reservoir sample -> approximate per-column medians
+      2. running mean / variance of the imputed data (partial_fit)
+    Saves both artifacts like the in-memory training path.
+    """
+    sampler = ReservoirSampler(reservoir_size)
+    for chunk in iter_csv_chunks(path, chunksize):
+        sampler.update(extract_features(chunk))
+
+    imputer, scaler = feature_spec.make_preprocessors()
+    imputer.fit(pd.DataFrame(sampler.sample, columns=FEATURE_COLUMNS))
+
+    for chunk in iter_csv_chunks(path, chunksize):
+        scaler.partial_fit(imputer.transform(extract_features(chunk)))
+
+    save_artifact(scaler, SCALER_PATH)
+    save_artifact(imputer, IMPUTER_PATH)
+
+    return imputer, scaler
+
+def stream_preprocessed_data(path, training=True, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Generator version of load_and_preprocess_data for large CSVs.
+
+    path: CSV path
+    training: True -> fit scaler & imputer in streaming passes first
+              False -> use saved ones
+    Yields (X_scaled, y) per chunk; y is None when the target column
+    is absent. Memory stays bounded by chunksize.
+    """
+    if training:
+        imputer, scaler = fit_streaming_preprocessors(path, chunksize)
+    else:
+        imputer = get_imputer()
+        scaler = get_scaler()
+
+    for chunk in iter_csv_chunks(path, chunksize):
+        X_scaled = feature_spec.transform(extract_features(chunk), imputer, scaler)
+        y = chunk[TARGET_COL].to_numpy() if TARGET_COL in chunk else None
+        yield X_scaled, y
@@ -0,0 +1,261 @@
+import argparse
+import asyncio
+import json
+import math
+import threading
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from src.artifacts import get_imputer, get_model, get_scaler
+from src.batching import MAX_BATCH, MAX_WAIT_MS, BatchScheduler
+from src.feature_spec import DATE_COL, SENSOR_INPUTS
+from src.predict import INPUT_COLUMNS, predict_groundwater_levels
+from src.prediction_cache import dequantize_reading, prediction_cache
+
+# ===============================
+# Settings
+# ===============================
+LATENCY_WINDOW = 10_000
+
+# ===============================
+# Counters
+# ===============================
+class ServiceStats:
+    """
+    Counters updated from the event loop, the batch scheduler thread and
+    asyncio.to_thread workers, hence the lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.requests = 0
+        self.errors = 0
+        self.model_calls = 0
+        self.rows_scored = 0
+        self.latencies_ms = deque(maxlen=LATENCY_WINDOW)
+
+    def record_request(self, latency_s, ok=True):
+        with self._lock:
+            self.requests += 1
+            self.errors += 0 if ok else 1
+            self.latencies_ms.append(latency_s * 1000.0)
+
+    def record_model_call(self, rows):
+        with self._lock:
+            self.model_calls += 1
+            self.rows_scored += rows
+
+    def snapshot(self):
+        uptime = time.perf_counter() - self.started
+        with self._lock:
+            latencies = np.fromiter(self.latencies_ms, dtype=np.float64)
+            requests, errors = self.requests, self.errors
+            model_calls, rows_scored = self.model_calls, self.rows_scored
+        p50, p99 = np.percentile(latencies, [50, 99]) if len(latencies) else (0.0, 0.0)
+        return {
+            "uptime_s": round(uptime, 3),
+            "requests": requests,
+            "errors": errors,
+            "model_calls": model_calls,
+            "rows_scored": rows_scored,
+            "avg_batch_size": round(rows_scored / model_calls, 2) if model_calls else 0.0,
+            "throughput_rows_per_s": round(rows_scored / uptime, 2) if uptime else 0.0,
+            "latency_ms_p50": round(float(p50), 3),
+            "latency_ms_p99": round(float(p99), 3)
+        }
+
+# ===============================
+# ASGI application
+# ===============================
+class BadRequest(Exception):
+    pass
+
+def _validate_record(record):
+    if not isinstance(record, dict):
+        raise BadRequest("Each reading must be a JSON object")
+    missing = [col for col in INPUT_COLUMNS if col not in record]
+    if missing:
+        raise BadRequest(f"Missing fields: {', '.join(missing)}")
+
+    # null is allowed (imputed like a missing sensor value); anything
+    # else must be a number / a parseable date
+    for col in SENSOR_INPUTS:
+        value = record[col]
+        if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))):
+            raise BadRequest(f"{col} must be a number, got {value!r}")
+        if value is not None and not math.isfinite(value):
+            # json accepts NaN / Infinity, but the reply could not carry the result
+            raise BadRequest(f"{col} must be finite, got {value!r}")
+    date = record[DATE_COL]
+    if date is not None:
+        try:
+            if not isinstance(date, str):
+                raise TypeError
+            pd.Timestamp(date)
+        except (TypeError, ValueError):
+            raise BadRequest(f"{DATE_COL} is not a valid date: {date!r}")
+    return {col: record[col] for col in INPUT_COLUMNS}
+
+class PredictionApp:
+    """
+    Framework-free ASGI app. Routes:
+      POST /predict        one reading  -> {"prediction": float}
+                           (answered from the prediction cache when the
+                           quantized reading was scored before)
+      POST /predict/batch  {"records": [...]} -> {"predictions": [...]}
+      GET  /metrics        latency / throughput counters
+      GET  /health
+    Serve with any ASGI server, e.g. `uvicorn src.service:app`.
+    """
+
+    def __init__(self, max_batch=MAX_BATCH, max_wait_ms=MAX_WAIT_MS, fused=False):
+        self.fused = fused
+        self.stats = ServiceStats()
+        # Concurrent single requests are grouped into one vectorized call
+        self.scheduler = BatchScheduler(self._predict_records, max_batch, max_wait_ms)
+
+    def _predict_records(self, records):
+        predictions = predict_groundwater_levels(records, fused=self.fused)
+        self.stats.record_model_call(len(records))
+        return predictions
+
+    async def _predict_one(self, record):
+        # Hits never leave the event loop; misses join the next batch
+        key, value = prediction_cache.get(record)
+        if value is None:
+            future = self.scheduler.submit(dequantize_reading(key))
+            value = await asyncio.wrap_future(future)
+            prediction_cache.put(key, value)
+        return value
+
+    def warm_up(self):
+        get_model()
+        get_scaler()
+        get_imputer()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        start = time.perf_counter()
+        status, payload = await self._route(scope, receive)
+        self.stats.record_request(time.perf_counter() - start, ok=status < 400)
+
+        body = json.dumps(payload).encode()
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode())
+            ]
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await asyncio.to_thread(self.warm_up)
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await asyncio.to_thread(self.scheduler.close)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _route(self, scope, receive):
+        method, path = scope["method"], scope["path"].rstrip("/") or "/"
+
+        try:
+            if method == "GET" and path == "/health":
+                return 200, {"status": "ok"}
+            if method == "GET" and path == "/metrics":
+                return 200, {**self.stats.snapshot(), "prediction_cache": prediction_cache.stats()}
+            if method == "POST" and path == "/predict":
+                record = _validate_record(await _read_json(receive))
+                return 200, {"prediction": await self._predict_one(record)}
+            if method == "POST" and path == "/predict/batch":
+                payload = await _read_json(receive)
+                records = payload.get("records") if isinstance(payload, dict) else None
+                if not isinstance(records, list):
+                    raise BadRequest('Expected {"records": [...]}')
+                records = [_validate_record(r) for r in records]
+                predictions = await asyncio.to_thread(self._predict_records, records)
+                return 200, {"predictions": [float(p) for p in predictions]}
+        except BadRequest as exc:
+            return 400, {"error": str(exc)}
+        except Exception as exc:
+            return 500, {"error": f"{type(exc).__name__}: {exc}"}
+
+        return 404, {"error": f"No route for {method} {path}"}
+
+async def _read_json(receive):
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body"):
+            break
+    try:
+        return json.loads(b"".join(chunks) or b"null")
+    except ValueError:
+        raise BadRequest("Body is not valid JSON")
+
+app = PredictionApp()
+
+# ===============================
+# In-process client (no server needed)
+# ===============================
+async def request(asgi_app, method, path, payload=None):
+    """
+    Drives asgi_app directly and returns (status, decoded JSON body).
+    """
+    body = b"" if payload is None else json.dumps(payload).encode()
+    scope = {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "headers": [(b"content-type", b"application/json")],
+        "query_string": b""
+    }
+    sent = False
+    response = {}
+
+    async def receive():
+        nonlocal sent
+        if sent:
+            return {"type": "http.disconnect"}
+        sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+        elif message["type"] == "http.response.body":
+            response["body"] = response.get("body", b"") + message.get("body", b"")
+
+    await asgi_app(scope, receive, send)
+    return response["status"], json.loads(response["body"])
+
+def main():
+    parser = argparse.ArgumentParser(description="Groundwater prediction HTTP service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    try:
+        import uvicorn
+    except ImportError:
+        raise SystemExit("Install an ASGI server to run the service, e.g. `pip install uvicorn`")
+
+    uvicorn.run("src.service:app", host=args.host, port=args.port)
+
+if __name__ == "__main__":
+    main()
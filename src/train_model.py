@@ -1,33 +1,188 @@
+import argparse
 import os
-import joblib
+import numpy as np
 from sklearn.linear_model import LinearRegression
 from sklearn.metrics import mean_squared_error, r2_score
 
-from src.preprocessing import load_and_preprocess_data
+from src import model_selection
+from src.artifacts import (
+    FUSED_PATH,
+    IMPUTER_PATH,
+    MODEL_PATH,
+    SCALER_PATH,
+    load_artifact,
+    save_artifact
+)
+from src.dataset import load_dataset
+from src.feature_store import load_feature_matrix, save_feature_matrix
+from src.fused_pipeline import FusedPipeline, check_parity
+from src.preprocessing import (
+    DEFAULT_CHUNKSIZE,
+    FEATURE_COLUMNS,
+    extract_features,
+    iter_csv_chunks,
+    load_and_preprocess_data,
+    stream_preprocessed_data
+)
 
 # ===============================
 # Paths
 # ===============================
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_PATH = os.path.join(BASE_DIR, "Data", "DWLR_Dataset_2023.csv")
-MODEL_PATH = os.path.join(BASE_DIR, "model", "groundwater_model.pkl")
 
-def main():
-    print("📥 Loading and preprocessing data...")
-    X, y, _ = load_and_preprocess_data(DATA_PATH, training=True)
+def export_fused_pipeline(model, X_raw):
+    imputer = load_artifact(IMPUTER_PATH)
+    scaler = load_artifact(SCALER_PATH)
+
+    fused = FusedPipeline.from_sklearn(imputer, scaler, model, FEATURE_COLUMNS)
+    check_parity(fused, imputer, scaler, model, X_raw)
+
+    fused.save(FUSED_PATH)
+    print("🔗 Fused pipeline exported (parity with sklearn verified)")
+    return fused
+
+# ===============================
+# Out-of-core training
+# ===============================
+def fit_incremental(batches):
+    """
+    Ordinary least squares from per-batch sufficient statistics.
+
+    batches: iterable of (X, y) arrays
+    Accumulates XᵀX and Xᵀy (with an intercept column), so memory is
+    O(n_features²) regardless of row count. The solution is the same
+    as LinearRegression.fit on the concatenated data.
+    """
+    xtx = None
+    xty = None
+
+    for X, y in batches:
+        Xa = np.column_stack([X, np.ones(len(X))])
+        if xtx is None:
+            xtx = np.zeros((Xa.shape[1], Xa.shape[1]))
+            xty = np.zeros(Xa.shape[1])
+        xtx += Xa.T @ Xa
+        xty += Xa.T @ np.asarray(y, dtype=np.float64)
+
+    if xtx is None:
+        raise ValueError("No training rows")
+
+    beta = np.linalg.lstsq(xtx, xty, rcond=None)[0]
+
+    model = LinearRegression()
+    model.coef_ = beta[:-1]
+    model.intercept_ = float(beta[-1])
+    model.n_features_in_ = len(beta) - 1
+    return model
+
+def streaming_metrics(model, batches):
+    """
+    RMSE and R² accumulated batch by batch. The target variance is
+    merged per batch from running mean / M2 (Welford, Chan et al.), so
+    SST keeps its precision over tens of millions of rows.
+    """
+    n = 0
+    sse = 0.0
+    mean = 0.0
+    m2 = 0.0
+
+    for X, y in batches:
+        y = np.asarray(y, dtype=np.float64)
+        if not len(y):
+            continue
+        err = y - model.predict(X)
+        sse += float(err @ err)
+
+        n_b = len(y)
+        mean_b = float(y.mean())
+        m2_b = float(((y - mean_b) ** 2).sum())
+        delta = mean_b - mean
+        total = n + n_b
+        mean += delta * n_b / total
+        m2 += m2_b + delta ** 2 * n * n_b / total
+        n = total
+
+    return np.sqrt(sse / n), 1.0 - sse / m2
+
+def train_incremental(data_path=DATA_PATH, chunksize=DEFAULT_CHUNKSIZE):
+    print(f"📥 Streaming data in chunks of {chunksize} rows...")
+    model = fit_incremental(
+        stream_preprocessed_data(data_path, training=True, chunksize=chunksize)
+    )
+
+    save_artifact(model, MODEL_PATH)
+
+    # Parity check on the first chunk keeps memory bounded
+    first_chunk = next(iter(iter_csv_chunks(data_path, chunksize)))
+    export_fused_pipeline(model, extract_features(first_chunk))
+
+    return streaming_metrics(
+        model,
+        stream_preprocessed_data(data_path, training=False, chunksize=chunksize)
+    )
+
+def train_in_memory(data_path=DATA_PATH, save_features=False, from_features=False):
+    if from_features:
+        # Reuses the saved imputer & scaler; X / y are read-only memmaps
+        print("📥 Opening memory-mapped feature matrix...")
+        X, y = load_feature_matrix(data_path)
+    else:
+        print("📥 Loading and preprocessing data...")
+        X, y, _ = load_and_preprocess_data(data_path, training=True)
+        if save_features:
+            save_feature_matrix(X, y, data_path)
 
     print("🧠 Training Linear Regression model...")
     model = LinearRegression()
     model.fit(X, y)
 
     # Save model
-    os.makedirs(os.path.dirname(MODEL_PATH), exist_ok=True)
-    joblib.dump(model, MODEL_PATH)
+    save_artifact(model, MODEL_PATH)
+
+    # Fused NumPy artifact (sklearn chain stays the reference)
+    export_fused_pipeline(model, extract_features(load_dataset(data_path)))
 
     # ---- Evaluation ----
     y_pred = model.predict(X)
-    rmse = mean_squared_error(y, y_pred, squared=False)
+    rmse = np.sqrt(mean_squared_error(y, y_pred))
     r2 = r2_score(y, y_pred)
+    return rmse, r2
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the groundwater model")
+    parser.add_argument("--data", default=DATA_PATH)
+    subcommands = parser.add_subparsers(dest="command")
+    model_selection.add_arguments(
+        subcommands.add_parser("select", help="parallel model-family / hyperparameter search"),
+        data_default=argparse.SUPPRESS
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="out-of-core training over CSV chunks"
+    )
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument(
+        "--save-features",
+        action="store_true",
+        help="persist the preprocessed matrix as .npy for memory-mapped reuse"
+    )
+    parser.add_argument(
+        "--from-features",
+        action="store_true",
+        help="retrain from the memory-mapped feature matrix"
+    )
+    args = parser.parse_args()
+
+    if args.command == "select":
+        model_selection.run_from_args(args)
+        return
+
+    if args.incremental:
+        rmse, r2 = train_incremental(args.data, args.chunksize)
+    else:
+        rmse, r2 = train_in_memory(args.data, args.save_features, args.from_features)
 
     print("\n✅ Training Complete")
     print(f"RMSE : {rmse:.3f}")
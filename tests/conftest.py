@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Repo root for `src.*`, app/ for `utils.*` (as Streamlit runs the pages)
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (ROOT_DIR, os.path.join(ROOT_DIR, "app")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
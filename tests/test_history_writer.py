@@ -0,0 +1,108 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from utils.history_store import HistoryStore
+from utils.history_writer import HistoryWriter, journal_path_for
+
+APP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app")
+
+# Appends records (printing each uid once acknowledged), then either
+# flushes and closes, or waits for a line on stdin and dies without
+# flushing or running atexit handlers
+CHILD = """
+import os, sys
+sys.path.insert(0, {app!r})
+from utils.history_store import HistoryStore
+from utils.history_writer import HistoryWriter
+
+writer = HistoryWriter(HistoryStore({db!r}), {journals!r}, max_batch={records} + 1, flush_interval=60.0)
+for i in range({records}):
+    print(writer.append(float(i), user={name!r}, month="January"), flush=True)
+if {crash}:
+    print("ready", flush=True)
+    sys.stdin.readline()
+    os._exit(1)
+writer.flush()
+writer.close()
+"""
+
+def _spawn(name, db, journals, records, crash):
+    script = CHILD.format(app=APP_DIR, db=db, journals=journals, records=records, name=name, crash=crash)
+    return subprocess.Popen(
+        [sys.executable, "-c", script],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True
+    )
+
+def _stored_uids(store):
+    return {uid for (uid,) in store._connect().execute("SELECT uid FROM predictions")}
+
+@pytest.fixture
+def paths(tmp_path):
+    return str(tmp_path / "history.db"), str(tmp_path / "journals")
+
+@pytest.mark.skipif(sys.platform == "win32", reason="flock-based journal locks")
+def test_no_acknowledged_record_lost_when_a_process_crashes(paths):
+    db, journals = paths
+    records = 300
+
+    # B journals its records and stays alive holding its journal lock
+    crashing = _spawn("B", db, journals, records, crash=True)
+    acknowledged = set()
+    for line in crashing.stdout:
+        if line.strip() == "ready":
+            break
+        acknowledged.add(line.strip())
+    assert len(acknowledged) == records
+
+    # A starts (recovery must skip B's live journal), commits and exits
+    clean = _spawn("A", db, journals, records, crash=False)
+    out, _ = clean.communicate(timeout=60)
+    assert clean.returncode == 0
+    acknowledged.update(out.split())
+
+    # B dies with everything still only in its journal
+    crashing.stdin.write("\n")
+    crashing.stdin.flush()
+    crashing.wait(timeout=60)
+    assert crashing.returncode == 1
+
+    store = HistoryStore(db)
+    writer = HistoryWriter(store, journals)
+    writer.close()
+
+    assert writer.recovered == records
+    assert acknowledged <= _stored_uids(store)
+    assert store.count() == 2 * records
+    assert not os.listdir(journals)
+
+def test_replay_is_idempotent(paths):
+    db, journals = paths
+    store = HistoryStore(db)
+    os.makedirs(journals)
+
+    # A journal left by a dead process whose records were partly committed
+    writer = HistoryWriter(store, journals, flush_interval=60.0)
+    uids = [writer.append(float(i)) for i in range(5)]
+    store.append_many([writer._pending[uid] for uid in uids[:2]])
+    stale = journal_path_for(journals, 999_999_999)
+    with open(writer.journal_path, encoding="utf-8") as src, open(stale, "w", encoding="utf-8") as dst:
+        dst.write(src.read())
+    writer.close()
+
+    HistoryWriter(store, journals).close()
+    assert store.count() == 5
+    assert set(uids) == _stored_uids(store)
+
+def test_close_commits_and_removes_journal(paths):
+    db, journals = paths
+    store = HistoryStore(db)
+    writer = HistoryWriter(store, journals, flush_interval=60.0)
+    for i in range(10):
+        writer.append(float(i), month="March")
+    writer.close()
+
+    assert store.count() == 10
+    assert not os.path.exists(writer.journal_path)
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+from sklearn.linear_model import LinearRegression
+from sklearn.metrics import mean_squared_error, r2_score
+
+from src.train_model import fit_incremental, streaming_metrics
+
+def _data(n=5_000, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, 5))
+    y = X @ np.array([0.5, -1.0, 2.0, 0.0, 0.3]) + 3.4 + rng.normal(0, 0.1, n)
+    return X, y
+
+def _chunks(X, y, size):
+    for start in range(0, len(X), size):
+        yield X[start:start + size], y[start:start + size]
+
+@pytest.mark.parametrize("chunksize", [777, 5_000, 50_000])
+def test_incremental_fit_matches_batch_fit(chunksize):
+    X, y = _data()
+    batch = LinearRegression().fit(X, y)
+    incremental = fit_incremental(_chunks(X, y, chunksize))
+
+    np.testing.assert_allclose(incremental.coef_, batch.coef_, atol=1e-6)
+    assert incremental.intercept_ == pytest.approx(batch.intercept_, abs=1e-6)
+    np.testing.assert_allclose(incremental.predict(X), batch.predict(X), atol=1e-6)
+
+def test_streaming_metrics_match_full_metrics():
+    X, y = _data()
+    model = LinearRegression().fit(X, y)
+    rmse, r2 = streaming_metrics(model, _chunks(X, y, 777))
+
+    assert rmse == pytest.approx(np.sqrt(mean_squared_error(y, model.predict(X))), rel=1e-9)
+    assert r2 == pytest.approx(r2_score(y, model.predict(X)), rel=1e-9)
+
+def test_streaming_r2_keeps_precision_with_large_offset():
+    # sum(y²) - sum(y)²/n cancels catastrophically when mean >> spread
+    X, y = _data(20_000, seed=1)
+    y = y + 1e8
+    model = LinearRegression().fit(X, y)
+    _, r2 = streaming_metrics(model, _chunks(X, y, 777))
+
+    assert r2 == pytest.approx(r2_score(y, model.predict(X)), rel=1e-6)
+
+def test_incremental_fit_rejects_empty_input():
+    with pytest.raises(ValueError):
+        fit_incremental(iter(()))